@@ -0,0 +1,212 @@
+"""Compare decoding API payloads into the typed records of models.py with json.loads into dicts.
+
+Every payload holds the given number of records with the extra keys the real API sends. The dict
+path is json.loads plus reading the fields the code uses, the typed path decodes the bytes straight
+into msgspec structs and reads the same attributes. Reports the decode time and the peak and
+retained memory, all per 1000 records. orjson is measured too if it is installed.
+Run from the repository root:
+    python benchmarks/bench_decode.py --records 1000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kickbase_lister.call_api import decode  # noqa: E402
+from kickbase_lister.models import (  # noqa: E402
+    ActivityFeed,
+    MarketValues,
+    Performance,
+    Ranking,
+    Squad,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def activity(rng: random.Random, i: int) -> dict:
+    return {
+        "i": str(10_000_000 + i),
+        "t": 15 if rng.random() < 0.8 else 3,
+        "dt": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T12:00:00Z",
+        "data": {
+            "pi": str(rng.randrange(1000)),
+            "pn": f"Player {i}",
+            "trp": rng.randrange(500_000, 40_000_000),
+            "tid": str(rng.randrange(2, 50)),
+            "slr": f"manager{rng.randrange(10)}",
+            "byr": f"manager{rng.randrange(10)}",
+            "pim": f"content/file/{i}.png",
+        },
+        "adm": False,
+    }
+
+
+def squad_player(rng: random.Random, i: int) -> dict:
+    return {
+        "pi": str(i),
+        "pn": f"Player {i}",
+        "pos": rng.randrange(1, 5),
+        "mv": rng.randrange(500_000, 40_000_000),
+        "st": 1,
+        "mvgl": rng.randrange(-1_000_000, 1_000_000),
+        "lst": rng.randrange(1_000_000, 40_000_000),
+        "pim": f"content/file/{i}.png",
+    }
+
+
+def ranking_entry(rng: random.Random, i: int) -> dict:
+    return {
+        "i": str(i),
+        "n": f"manager{i}",
+        "tv": rng.randrange(50_000_000, 300_000_000),
+        "sp": rng.randrange(3000),
+        "mdp": rng.randrange(150),
+        "uim": f"content/file/{i}.png",
+    }
+
+
+def market_value_point(rng: random.Random, i: int) -> dict:
+    return {"dt": 20_000 + i, "mv": rng.randrange(500_000, 40_000_000)}
+
+
+def match(rng: random.Random, i: int) -> dict:
+    return {
+        "day": 1 + i % 34,
+        "p": rng.randrange(-80, 300),
+        "mp": f"{rng.randrange(1, 91)}'",
+        "md": f"2025-01-{1 + i % 28:02d}T15:30:00Z",
+        "t1": str(rng.randrange(2, 50)),
+        "t2": str(rng.randrange(2, 50)),
+        "t1g": rng.randrange(5),
+        "t2g": rng.randrange(5),
+        "k": [rng.randrange(20) for _ in range(3)],
+    }
+
+
+### Payload builder, typed model and the fields the code reads from the dicts and from the structs
+KINDS = {
+    "activities": (
+        lambda rng, n: {"af": [activity(rng, i) for i in range(n)]},
+        ActivityFeed,
+        lambda data: [
+            (e["i"], e["dt"], e["t"], e["data"]["pi"], e["data"]["trp"])
+            for e in data.get("af", [])
+        ],
+        lambda feed: [
+            (e.id, e.date, e.type, e.data.player_id, e.data.price)
+            for e in feed.activities
+        ],
+    ),
+    "squads": (
+        lambda rng, n: {"it": [squad_player(rng, i) for i in range(n)]},
+        Squad,
+        lambda data: [(p["pi"], p.get("pos"), p.get("mv", 0)) for p in data["it"]],
+        lambda squad: [
+            (p.player_id, p.position, p.market_value) for p in squad.players
+        ],
+    ),
+    "rankings": (
+        lambda rng, n: {"us": [ranking_entry(rng, i) for i in range(n)]},
+        Ranking,
+        lambda data: {u["i"]: u["tv"] for u in data["us"]},
+        lambda ranking: {u.user_id: u.team_value for u in ranking.users},
+    ),
+    "market values": (
+        lambda rng, n: {"it": [market_value_point(rng, i) for i in range(n)]},
+        MarketValues,
+        lambda data: {p["dt"]: p["mv"] for p in data["it"]},
+        lambda values: {p.day: p.value for p in values.points},
+    ),
+    "performance": (
+        lambda rng, n: {
+            "it": [
+                {
+                    "ti": f"{2000 + s}/{2001 + s}",
+                    "ph": [match(rng, i) for i in range(34)],
+                }
+                for s in range(max(1, n // 34))
+            ]
+        },
+        Performance,
+        lambda data: [
+            (m["p"], m["mp"], season.get("ti"))
+            for season in data["it"]
+            for m in season["ph"]
+        ],
+        lambda performance: [
+            (m.points, m.minutes, season.title)
+            for season in performance.seasons
+            for m in season.matches
+        ],
+    ),
+}
+
+
+def measure(decoder, extract, body: bytes, repeat: int) -> dict:
+    """Best decode time over the repeats, peak and retained memory of one decode."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(decoder(body))
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    data = decoder(body)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return {"seconds": best, "peak_bytes": peak, "retained_bytes": retained}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(
+        f"{'payload':<14} {'decoder':<8} {'ms/1k':>8} {'peak KiB/1k':>12} "
+        f"{'kept KiB/1k':>12} {'speedup':>8}"
+    )
+    for kind, (build, model, extract_dict, extract_typed) in KINDS.items():
+        payload = build(random.Random(args.seed), args.records)
+        body = json.dumps(payload).encode()
+        count = len(extract_dict(payload))
+        decoders = {
+            "json": (json.loads, extract_dict),
+            "msgspec": (lambda body: decode(body, model), extract_typed),
+        }
+        if orjson:
+            decoders["orjson"] = (orjson.loads, extract_dict)
+        baseline = None
+        for name, (decoder, extract) in decoders.items():
+            result = measure(decoder, extract, body, args.repeat)
+            per_1k = 1000 / count
+            baseline = baseline or result["seconds"]
+            results.append(
+                {"payload": kind, "decoder": name, "records": count, **result}
+            )
+            print(
+                f"{kind:<14} {name:<8} {result['seconds'] * 1000 * per_1k:>8.3f} "
+                f"{result['peak_bytes'] / 1024 * per_1k:>12.1f} "
+                f"{result['retained_bytes'] / 1024 * per_1k:>12.1f} "
+                f"{baseline / result['seconds']:>7.1f}x"
+            )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""End-to-end benchmark of a league refresh against the local stub server (benchmarks/stub_server.py).
+
+For every league size the stages of kickbase_lister.user_list run one after another on an empty database and
+cache, then main() runs cold (empty working directory) and warm (second run in the same directory).
+Every step reports its wall time, the requests the stub received and the peak of traced memory.
+Run from the repository root:
+    python benchmarks/bench_e2e.py --sizes 8 18 50 100 --latency 0.02 --rate 50
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kickbase_lister import user_list  # noqa: E402
+from kickbase_lister.auth import login  # noqa: E402
+from kickbase_lister.cache import ResponseCache  # noqa: E402
+from kickbase_lister.call_api import KickbaseClient  # noqa: E402
+from kickbase_lister.fetch import FetchEngine  # noqa: E402
+from kickbase_lister.market_value import MarketValueStore  # noqa: E402
+from kickbase_lister.parse_html import style_table  # noqa: E402
+from kickbase_lister.store import Store  # noqa: E402
+from stub_server import KickbaseStub, LeagueData  # noqa: E402
+
+
+class Recorder:
+    def __init__(self, stub: KickbaseStub, size: int, memory: bool):
+        self.stub = stub
+        self.size = size
+        self.memory = memory
+        self.results: list[dict] = []
+
+    def measure(self, stage: str, function, *args, **kwargs):
+        """Run the stage and record its wall time, requests and peak memory."""
+        self.stub.reset_counts()
+        if self.memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(
+            io.StringIO()
+        ):  # report_league prints the table
+            result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if self.memory else 0
+        self.results.append(
+            {
+                "managers": self.size,
+                "stage": stage,
+                "seconds": elapsed,
+                "requests": self.stub.requests(),
+                "peak_mib": peak / 2**20,
+                "endpoints": dict(self.stub.counts),
+            }
+        )
+        return result
+
+
+def bench_stages(recorder: Recorder) -> None:
+    """Run the stages of report_league one by one on an empty database and cache."""
+    client = KickbaseClient(cache=ResponseCache())
+    user = recorder.measure("login", login, client)
+    league = user.leagues[0]
+    league_id = league["id"]
+    engine = FetchEngine(
+        client, concurrency=user_list.FETCH_CONCURRENCY, rate=user_list.FETCH_RATE
+    )
+    store = Store()
+    mv_store = MarketValueStore(engine, store)
+    match_days = recorder.measure("match days", user_list.get_match_days, client)
+    users = recorder.measure("users", user_list.get_users, client, league_id)
+    recorder.measure(
+        "team values",
+        user_list.get_team_value_per_match_day,
+        client,
+        league_id,
+        users,
+        store,
+        match_days,
+    )
+    recorder.measure(
+        "turnovers",
+        user_list.get_turnovers,
+        client,
+        league_id,
+        league["creation"],
+        users,
+        True,
+        store,
+        engine,
+        mv_store,
+    )
+    recorder.measure("stats", user_list.get_user_stats, engine, league_id, list(users))
+    recorder.measure("squads", user_list.get_user_team, engine, league_id, list(users))
+    recorder.measure("render", style_table, list(users.values()), "stages.html")
+    client.close()
+    store.close()
+
+
+def bench_size(size: int, args) -> list[dict]:
+    league = LeagueData(size, args.players, args.transfers, args.day)
+    stub = KickbaseStub(league, args.latency, args.rate).start()
+    os.environ["KICKBASE_API_URL"] = stub.url
+    recorder = Recorder(stub, size, not args.no_memory)
+    cwd = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as stages_dir:
+            os.chdir(stages_dir)
+            bench_stages(recorder)
+        with tempfile.TemporaryDirectory() as main_dir:
+            os.chdir(main_dir)
+            recorder.measure("main (cold)", user_list.main, open_browser=False)
+            recorder.measure("main (warm)", user_list.main, open_browser=False)
+    finally:
+        os.chdir(cwd)
+        stub.stop()
+    return recorder.results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 18, 50, 100])
+    parser.add_argument("--players", type=int, default=540)
+    parser.add_argument("--transfers", type=int, default=40, help="Per manager")
+    parser.add_argument("--day", type=int, default=10, help="Current match day")
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Stub latency in seconds"
+    )
+    parser.add_argument(
+        "--rate", type=float, help="Stub rate limit in requests per second"
+    )
+    parser.add_argument(
+        "--client-rate",
+        type=float,
+        default=user_list.FETCH_RATE,
+        help="Requests per second the client sends",
+    )
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    user_list.FETCH_RATE = args.client_rate
+    logging.getLogger().setLevel(logging.WARNING)
+    if not args.no_memory:
+        tracemalloc.start()
+    results = []
+    print(
+        f"{'managers':>8} {'stage':<14} {'seconds':>9} {'requests':>9} {'peak MiB':>9}"
+    )
+    for size in args.sizes:
+        for result in bench_size(size, args):
+            results.append(result)
+            print(
+                f"{result['managers']:>8} {result['stage']:<14} {result['seconds']:>9.3f} "
+                f"{result['requests']:>9} {result['peak_mib']:>9.1f}"
+            )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Fetch a batch through the FetchEngine from a local stub server that injects 429 and 503 responses.
+
+Compares the success rate and wall time without retries (the old behaviour, the first failure
+aborts the batch) and with the default retry policy. Run from the repository root:
+    python benchmarks/bench_retry.py --requests 300 --throttle 0.2 --errors 0.1
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kickbase_lister.call_api import KickbaseClient  # noqa: E402
+from kickbase_lister.fetch import FetchEngine  # noqa: E402
+from kickbase_lister.retry import RetryPolicy  # noqa: E402
+
+
+class FaultyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Needed for keep-alive
+    disable_nagle_algorithm = True
+    throttle = 0.0
+    errors = 0.0
+    retry_after = "0.1"
+    random = random.Random(0)
+    lock = threading.Lock()
+    body = json.dumps(
+        {"it": [{"dt": day, "mv": 500000} for day in range(365)]}
+    ).encode()
+
+    def reply(self, status: int, body: bytes = b"{}", headers: dict = {}):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        with self.lock:
+            roll = self.random.random()
+        if roll < self.throttle:
+            self.reply(429, headers={"Retry-After": self.retry_after})
+        elif roll < self.throttle + self.errors:
+            self.reply(503)
+        else:
+            self.reply(200, self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def bench(name: str, retry: RetryPolicy, base_url: str, n: int) -> None:
+    client = KickbaseClient(token="benchmark", base_url=base_url, retry=retry)
+    engine = FetchEngine(client, concurrency=8, rate=1000.0)
+    urls = [f"/v4/competitions/1/players/{i}/marketValue/365" for i in range(n)]
+    start = time.perf_counter()
+    results = engine.map(urls, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    ok = sum(not isinstance(result, Exception) for result in results)
+    print(f"{name:>12}: {ok}/{n} succeeded in {elapsed:.3f}s, {retry.retries} retries")
+    client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--throttle", type=float, default=0.2, help="Share of 429s")
+    parser.add_argument("--errors", type=float, default=0.1, help="Share of 503s")
+    args = parser.parse_args()
+
+    FaultyHandler.throttle = args.throttle
+    FaultyHandler.errors = args.errors
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FaultyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    bench("no retries", RetryPolicy(max_retries=0), base_url, args.requests)
+    bench("retries", RetryPolicy(base_delay=0.05), base_url, args.requests)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
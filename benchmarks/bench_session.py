@@ -0,0 +1,68 @@
+"""Compare bare requests.get calls with the pooled KickbaseClient session against a local stub server.
+
+Run from the repository root:
+    python benchmarks/bench_session.py --requests 500
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kickbase_lister.call_api import KickbaseClient  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Needed for keep-alive
+    disable_nagle_algorithm = True
+    body = json.dumps(
+        {"it": [{"dt": day, "mv": 500000} for day in range(365)]}
+    ).encode()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def bench(name: str, get, url: str, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        get(url).raise_for_status()
+    elapsed = time.perf_counter() - start
+    print(f"{name:>20}: {elapsed:.3f}s total, {elapsed / n * 1000:.3f}ms per request")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/v4/competitions/1/players/1/marketValue/365"
+
+    bare = bench("requests.get", requests.get, url, args.requests)
+    client = KickbaseClient(token="benchmark")
+    pooled = bench("KickbaseClient", client.get, url, args.requests)
+    print(
+        f"Saved {(bare - pooled) / args.requests * 1000:.3f}ms per request (plain HTTP, TLS saves more)"
+    )
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
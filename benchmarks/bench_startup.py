@@ -0,0 +1,82 @@
+"""Cold start benchmark of the command line interface.
+
+Every measurement starts a fresh interpreter that imports the module of one command the way
+`python -m kickbase_lister <command>` does. It reports the wall time of the whole process, the
+time spent importing and which heavy libraries were loaded. "cli" only imports the CLI itself,
+which is all `--help` needs.
+Run from the repository root:
+    python benchmarks/bench_startup.py --repeat 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("requests", "numpy", "matplotlib", "sqlite3", "asyncio")
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from kickbase_lister.cli import load_command
+if {command!r} != "cli":
+    load_command({command!r})
+print(json.dumps({{
+    "import_seconds": time.perf_counter() - start,
+    "modules": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure(command: str) -> dict:
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(command=command, heavy=HEAVY)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output)
+    result["process_seconds"] = time.perf_counter() - start
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--commands",
+        nargs="+",
+        default=["cli", "report", "serve", "crawl", "plot"],
+    )
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'command':<8} {'process ms':>11} {'import ms':>10}  heavy modules")
+    for command in args.commands:
+        runs = [measure(command) for _ in range(args.repeat)]
+        result = {
+            "command": command,
+            "process_seconds": statistics.median(
+                run["process_seconds"] for run in runs
+            ),
+            "import_seconds": statistics.median(run["import_seconds"] for run in runs),
+            "modules": runs[-1]["modules"],
+        }
+        results.append(result)
+        print(
+            f"{command:<8} {result['process_seconds'] * 1000:>11.1f} "
+            f"{result['import_seconds'] * 1000:>10.1f}  {', '.join(result['modules']) or '-'}"
+        )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Compare the turnover ledger with the nested-loop matching it replaced on a synthetic transfer log.
+
+The nested loops and the per-manager maximum search are kept here as the reference. The biggest
+overpay, win and loss of every manager must be identical for the whole log applied at once and for
+a ledger restored from saved state that only applies the newest transfers.
+Run from the repository root:
+    python benchmarks/bench_turnovers.py --transfers 10000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kickbase_lister.turnovers import TurnoverLedger, starter_buy  # noqa: E402
+
+LEAGUE_START = "2023-08-01T12:00:00Z"
+
+
+def match_turnovers_nested(transfers: list[dict], league_start: str) -> list:
+    """The matching as done before the ledger, kept as the reference."""
+    turnovers = []
+    for i, buy_transfer in enumerate(transfers):
+        if buy_transfer["type"] == "sell":
+            continue
+        for sell_transfer in transfers[i:]:
+            if sell_transfer["type"] == "buy":
+                continue
+            if sell_transfer["playerId"] == buy_transfer["playerId"]:
+                turnovers.append((buy_transfer, sell_transfer))
+                break
+    for transfer in transfers:
+        if transfer["type"] == "buy":
+            continue
+        if transfer not in [turnover[1] for turnover in turnovers]:
+            turnovers.append((starter_buy(transfer, league_start), transfer))
+    return turnovers
+
+
+def manager_stats_nested(transfers: list[dict], league_start: str) -> dict:
+    """Biggest overpay, win and loss of every manager as computed before the ledger."""
+    stats: dict[str, dict] = defaultdict(dict)
+    diffs: dict[str, list[tuple[int, str]]] = defaultdict(list)
+    for buy, sell in match_turnovers_nested(transfers, league_start):
+        if buy["tradePartner"] == "Kickbase" and buy["price"] == 0:
+            continue
+        diffs[buy["user"]].append((sell["price"] - buy["price"], buy["lastName"]))
+    managers = {t["user"] for t in transfers} | {t["tradePartner"] for t in transfers}
+    for manager in managers:
+        bought = [
+            t
+            for t in transfers
+            if (t["user"] == manager and t["type"] == "buy")
+            or (t["tradePartner"] == manager and t["type"] == "sell")
+        ]
+        if bought:
+            overpay = max(bought, key=lambda t: t["price"] - t["marketPrice"])
+            stats[manager]["overpay"] = {
+                "value": overpay["price"] - overpay["marketPrice"],
+                "player": overpay["lastName"],
+            }
+        if diffs[manager]:
+            for stat, pick in (("win", max), ("loss", min)):
+                value, player = pick(diffs[manager], key=lambda diff: diff[0])
+                stats[manager][stat] = {"value": value, "player": player}
+    return dict(stats)
+
+
+def ledger_stats(ledger: TurnoverLedger) -> dict:
+    return {manager: stats for manager, stats in ledger.managers.items() if stats}
+
+
+def synthetic_transfers(n: int, players: int, managers: int, seed: int) -> list[dict]:
+    """Multi season transfer log, players are bought and sold in turns, some starters are only sold."""
+    rng = random.Random(seed)
+    owner: dict[int, str] = {
+        player_id: f"manager{rng.randrange(managers)}"
+        for player_id in range(players)
+        if rng.random() < 0.3
+    }
+    transfers = []
+    for i in range(n):
+        player_id = rng.randrange(players)
+        kind = "sell" if player_id in owner else "buy"
+        if rng.random() < 0.01:
+            kind = "unknown"
+        user = owner.pop(player_id, f"manager{rng.randrange(managers)}")
+        if kind == "buy":
+            owner[player_id] = user
+        transfers.append(
+            {
+                "date": f"{2023 + i * 3 // n}-01-01T00:00:{i:07d}Z",
+                "type": kind,
+                "user": user,
+                "tradePartner": "Kickbase",
+                "price": rng.randrange(500_000, 40_000_000),
+                "playerId": player_id,
+                "teamId": player_id % 18,
+                "firstName": None,
+                "lastName": f"Player{player_id}",
+                "marketPrice": rng.randrange(500_000, 40_000_000),
+            }
+        )
+    return transfers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transfers", type=int, default=10_000)
+    parser.add_argument("--players", type=int, default=1_500)
+    parser.add_argument("--managers", type=int, default=18)
+    parser.add_argument("--new", type=int, default=100, help="Transfers of a later run")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    transfers = synthetic_transfers(
+        args.transfers, args.players, args.managers, args.seed
+    )
+    start = time.perf_counter()
+    expected = manager_stats_nested(transfers, LEAGUE_START)
+    nested = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ledger = TurnoverLedger(LEAGUE_START)
+    for transfer in transfers:
+        ledger.apply(transfer)
+    full = time.perf_counter() - start
+    assert ledger_stats(ledger) == expected, "Ledger differs from the nested loops"
+
+    ### A later run restores the saved state and only applies its new transfers
+    old, new = transfers[: -args.new], transfers[-args.new :]
+    saved = TurnoverLedger(LEAGUE_START)
+    for transfer in old:
+        saved.apply(transfer)
+    state = saved.changes()
+    start = time.perf_counter()
+    restored = TurnoverLedger(
+        LEAGUE_START,
+        [buy for buys in state["positions"].values() for buy in buys],
+        state["stats"],
+    )
+    for transfer in new:
+        restored.apply(transfer)
+    incremental = time.perf_counter() - start
+    assert ledger_stats(restored) == expected, "Restored ledger differs"
+
+    print(
+        f"{len(transfers)} transfers, {len(ledger.turnovers)} turnovers, "
+        f"stats of {len(expected)} managers (identical)"
+    )
+    print(f"  nested loops:           {nested:.3f}s")
+    print(f"  ledger, all transfers:  {full:.4f}s ({nested / full:.0f}x faster)")
+    print(f"  ledger, {len(new)} new transfers: {incremental:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,427 @@
+"""Local Kickbase API stub serving synthetic but realistically sized payloads.
+
+Covers every endpoint used by kickbase_lister.user_list and kickbase_lister.player_analyze: login, overview, dashboard,
+squad, activitiesFeed, ranking, matchdays, players, marketValue, manager transfers, performance,
+table and teamprofile. Latency and a rate limit (answered with 429 and Retry-After) can be injected.
+
+Run standalone and point the client to it:
+    python benchmarks/stub_server.py --port 8080 --managers 18 --latency 0.05
+    KICKBASE_API_URL=http://127.0.0.1:8080 python -m kickbase_lister report --all
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+EPOCH = datetime(1970, 1, 1)
+LEAGUE_ID = "1000"
+LEAGUE_NAME = "Benchmark League"
+TEAMS = 18
+MATCH_DAYS = 34
+SEASONS = ("2023/2024", "2024/2025")
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def iso(date: datetime) -> str:
+    return date.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class LeagueData:
+    def __init__(
+        self,
+        managers: int = 18,
+        players: int = 540,
+        transfers_per_manager: int = 40,
+        current_day: int = 10,
+        seed: int = 0,
+    ):
+        """Synthetic league with its managers, player pool, transfer history and match days.
+
+        Args:
+            managers (int): Number of managers in the league.
+            players (int): Number of players in the competition, spread over 18 teams.
+            transfers_per_manager (int): Transfers in the activity feed per manager.
+            current_day (int): Current match day, earlier match days are finished.
+            seed (int): Seed of the generated data, equal seeds give equal payloads.
+        """
+        rng = random.Random(seed)
+        self.today = utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.today_number = (self.today - EPOCH).days
+        self.current_day = current_day
+        self.creation = self.today - timedelta(days=7 * current_day + 14)
+        self.managers = [
+            {"i": str(1 + i), "n": f"Manager {i + 1}"} for i in range(managers)
+        ]
+        self.players = {
+            str(10000 + i): {
+                "i": str(10000 + i),
+                "fn": f"First{i}",
+                "ln": f"Last{i}",
+                "tid": str(2 + i % TEAMS),
+                "pos": 1 + i % 4,
+                "st": 0,
+                "mv": rng.randrange(500_000, 40_000_000, 10_000),
+            }
+            for i in range(players)
+        }
+        player_ids = list(self.players)
+        self.squads = {
+            manager["i"]: rng.sample(player_ids, 15) for manager in self.managers
+        }
+        self.feed = self._feed(rng, transfers_per_manager * managers)
+        self.match_days = [
+            {
+                "day": day,
+                "it": [
+                    {
+                        "dt": iso(self.creation + timedelta(days=7 * day, hours=h)),
+                        "t1": str(2 + h),
+                        "t2": str(3 + h),
+                    }
+                    for h in range(9)
+                ],
+            }
+            for day in range(1, MATCH_DAYS + 1)
+        ]
+
+    def _feed(self, rng: random.Random, transfers: int) -> list[dict]:
+        """Activity feed with buys, sells and trades between managers, newest first."""
+        owner: dict[str, str] = {}
+        activities = []
+        names = [manager["n"] for manager in self.managers]
+        seconds = (self.today - self.creation).total_seconds()
+        for k in range(transfers):
+            date = self.creation + timedelta(seconds=seconds * k / max(transfers, 1))
+            player_id = rng.choice(list(self.players))
+            player = self.players[player_id]
+            price = int(player["mv"] * rng.uniform(0.9, 1.2))
+            data = {
+                "pi": player_id,
+                "pn": player["ln"],
+                "tid": player["tid"],
+                "trp": price,
+            }
+            if player_id in owner and rng.random() < 0.3:
+                data["slr"] = owner[player_id]
+                data["byr"] = owner[player_id] = rng.choice(names)
+            elif player_id in owner:
+                data["slr"] = owner.pop(player_id)
+            else:
+                data["byr"] = owner[player_id] = rng.choice(names)
+            activities.append({"i": f"t{k}", "t": 15, "dt": iso(date), "data": data})
+            ### Other activity types are in the feed too
+            activities.append(
+                {
+                    "i": f"a{k}",
+                    "t": 3,
+                    "dt": iso(date + timedelta(seconds=1)),
+                    "data": {},
+                }
+            )
+        return activities[::-1]
+
+    def market_values(self, player_id: str) -> dict:
+        base = self.players.get(player_id, {"mv": 1_000_000})["mv"]
+        return {
+            "it": [
+                {"dt": day, "mv": int(base * (1 + 0.2 * ((day * 7919) % 100) / 100))}
+                for day in range(self.today_number - 365, self.today_number + 1)
+            ],
+            "trp": base,
+            "lmv": base,
+            "hmv": int(base * 1.2),
+        }
+
+    def performance(self, player_id: str) -> dict:
+        rng = random.Random(player_id)
+        return {
+            "it": [
+                {
+                    "ti": season,
+                    "n": "Bundesliga",
+                    "ph": [
+                        {
+                            "day": day,
+                            "p": rng.randint(-40, 300),
+                            "mp": f"{rng.randint(1, 90)}'",
+                            "md": iso(self.creation + timedelta(days=7 * day)),
+                            "t1": "2",
+                            "t2": "3",
+                            "t1g": rng.randint(0, 4),
+                            "t2g": rng.randint(0, 4),
+                            "pt": "2",
+                            "k": [rng.randint(1, 20) for _ in range(3)],
+                            "st": 5,
+                        }
+                        for day in range(1, MATCH_DAYS + 1)
+                        if rng.random() < 0.8
+                    ],
+                }
+                for season in SEASONS
+            ]
+        }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Needed for keep-alive
+    disable_nagle_algorithm = True
+    server: "KickbaseStub"
+
+    def reply(self, status: int, data: Optional[dict] = None, headers: dict = {}):
+        body = json.dumps(data if data is not None else {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def admit(self) -> bool:
+        """Count the request, inject the latency and answer 429 if the rate limit is exceeded."""
+        self.server.count(self.command, urlsplit(self.path).path)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        wait = self.server.limiter_wait()
+        if wait:
+            self.reply(429, {"err": 429}, {"Retry-After": f"{wait:.3f}"})
+            return False
+        return True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.admit():
+            return
+        if urlsplit(self.path).path != "/v4/user/login":
+            return self.reply(404)
+        league = self.server.league
+        self.reply(
+            200,
+            {
+                "tkn": "stub-token",
+                "tknex": iso(utcnow() + timedelta(days=1)),
+                "srvl": [
+                    {
+                        "id": LEAGUE_ID,
+                        "name": LEAGUE_NAME,
+                        "creation": iso(league.creation),
+                    }
+                ],
+                "u": {"id": "1", "name": "Manager 1", "email": "stub@example.com"},
+            },
+        )
+
+    def do_GET(self):
+        if not self.admit():
+            return
+        url = urlsplit(self.path)
+        path, query = url.path, parse_qs(url.query)
+        league = self.server.league
+        if re.fullmatch(r"/v4/leagues/\d+/overview", path):
+            return self.reply(200, {"us": league.managers, "lnm": LEAGUE_NAME})
+        if match := re.fullmatch(r"/v4/leagues/\d+/managers/(\d+)/dashboard", path):
+            index = int(match.group(1))
+            return self.reply(
+                200,
+                {
+                    "mdw": index % 4,
+                    "pl": index,
+                    "tp": 3000 - 10 * index,
+                    "tv": 100_000_000 + 1_000_000 * index,
+                },
+            )
+        if match := re.fullmatch(r"/v4/leagues/\d+/managers/(\d+)/squad", path):
+            squad = league.squads.get(match.group(1), [])
+            return self.reply(
+                200,
+                {
+                    "it": [
+                        {
+                            "pi": player_id,
+                            "pn": league.players[player_id]["ln"],
+                            "pos": league.players[player_id]["pos"],
+                            "tid": league.players[player_id]["tid"],
+                            "mv": league.players[player_id]["mv"],
+                            "st": 0,
+                        }
+                        for player_id in squad
+                    ]
+                },
+            )
+        if match := re.fullmatch(r"/v4/leagues/\d+/managers/(\d+)/transfer", path):
+            start = int(query.get("start", ["0"])[0])
+            squad = league.squads.get(match.group(1), [])[:11]
+            items = [{"pi": player_id, "tty": 0, "trp": 0} for player_id in squad]
+            return self.reply(200, {"it": items[start : start + 25]})
+        if re.fullmatch(r"/v4/leagues/\d+/activitiesFeed/?", path):
+            start = int(query.get("start", ["0"])[0])
+            size = int(query.get("max", ["26"])[0])
+            return self.reply(200, {"af": league.feed[start : start + size]})
+        if re.fullmatch(r"/v4/leagues/\d+/ranking/?", path):
+            day = int(query.get("dayNumber", [league.current_day])[0])
+            return self.reply(
+                200,
+                {
+                    "us": [
+                        {
+                            "i": manager["i"],
+                            "n": manager["n"],
+                            "tv": 100_000_000 + 250_000 * day * int(manager["i"]),
+                            "sp": 100 * day,
+                        }
+                        for manager in league.managers
+                    ]
+                },
+            )
+        if re.fullmatch(r"/v4/competitions/\d+/matchdays", path):
+            return self.reply(200, {"day": league.current_day, "it": league.match_days})
+        if re.fullmatch(r"/v4/competitions/\d+/table", path):
+            return self.reply(
+                200,
+                {
+                    "it": [
+                        {"tid": str(2 + t), "tn": f"Team {2 + t}"} for t in range(TEAMS)
+                    ]
+                },
+            )
+        if match := re.fullmatch(r"/v4/competitions/\d+/teams/(\d+)/teamprofile", path):
+            team_id = match.group(1)
+            return self.reply(
+                200,
+                {
+                    "tid": team_id,
+                    "tn": f"Team {team_id}",
+                    "it": [
+                        {
+                            "i": player["i"],
+                            "n": player["ln"],
+                            "st": player["st"],
+                            "mv": player["mv"],
+                            "pos": player["pos"],
+                        }
+                        for player in league.players.values()
+                        if player["tid"] == team_id
+                    ],
+                },
+            )
+        if match := re.fullmatch(
+            r"/v4/competitions/\d+/players/(\d+)/marketValue/\d+", path
+        ):
+            return self.reply(200, league.market_values(match.group(1)))
+        if match := re.fullmatch(
+            r"/v4/competitions/\d+/players/(\d+)/performance", path
+        ):
+            return self.reply(200, league.performance(match.group(1)))
+        if match := re.fullmatch(r"/v4/competitions/\d+/players/(\d+)", path):
+            player = league.players.get(match.group(1))
+            if player is None:
+                return self.reply(404)
+            return self.reply(200, dict(player, shn=7, tp=500, ap=50))
+        self.reply(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class KickbaseStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        league: LeagueData,
+        latency: float = 0.0,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        port: int = 0,
+    ):
+        """Stub server of the Kickbase API.
+
+        Args:
+            league (LeagueData): Data served by the stub.
+            latency (float): Seconds every request is delayed.
+            rate (float): Requests per second before answering 429, unlimited if not given.
+            burst (float): Requests allowed at once before the rate applies.
+            port (int): Port to listen on, a free one if 0.
+        """
+        super().__init__(("127.0.0.1", port), StubHandler)
+        self.league = league
+        self.latency = latency
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate or 1.0, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def count(self, method: str, path: str) -> None:
+        endpoint = method + " " + re.sub(r"/\d+", "/{id}", path)
+        with self._lock:
+            self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+
+    def limiter_wait(self) -> float:
+        """Take a token of the rate limit, return the seconds until one is available if there is none."""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def requests(self) -> int:
+        with self._lock:
+            return sum(self.counts.values())
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.counts.clear()
+
+    def start(self) -> "KickbaseStub":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--managers", type=int, default=18)
+    parser.add_argument("--players", type=int, default=540)
+    parser.add_argument("--transfers", type=int, default=40, help="Per manager")
+    parser.add_argument("--day", type=int, default=10, help="Current match day")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--rate", type=float, help="Requests per second")
+    args = parser.parse_args()
+    league = LeagueData(args.managers, args.players, args.transfers, args.day)
+    stub = KickbaseStub(league, args.latency, args.rate, port=args.port)
+    print(f"Serving the stub API on {stub.url}")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
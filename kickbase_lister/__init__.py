@@ -0,0 +1,4 @@
+"""Stats of Kickbase leagues that the app doesn't show, as styled HTML tables.
+
+Importing the package has no side effects, the commands live in kickbase_lister.cli.
+"""
@@ -0,0 +1,3 @@
+from kickbase_lister.cli import main
+
+main()
@@ -0,0 +1,296 @@
+# Points per minute analytics of the player performance collected by player_analyze.py (`python -m kickbase_lister crawl`).
+# The matches of all players are kept in flat NumPy arrays, so every statistic is one vectorized
+# pass (grouped reductions with bincount) instead of Python loops per player.
+from typing import Optional, Sequence
+import numpy as np
+from .columnar import PERFORMANCE_DIR, load_columns, save_columns
+from .state import state_path
+
+GROUPS = ("player", "team", "position", "season")
+PERCENTILES = (10, 25, 50, 75, 90)
+HISTOGRAM_BINS = 50
+### Groups whose percentiles and histogram are written with the columns, load restores them
+PRECOMPUTED = (None, "team", "position")
+
+
+def season_year(title: Optional[str]) -> int:
+    """First year of a season title like "2024/2025", 0 if unknown."""
+    try:
+        return int(str(title)[:4])
+    except ValueError:
+        return 0
+
+
+class PerformanceData:
+    def __init__(
+        self,
+        points: np.ndarray,
+        minutes: np.ndarray,
+        player: np.ndarray,
+        season: np.ndarray,
+        player_ids: Sequence[str],
+        player_names: Sequence[str],
+        player_team: np.ndarray,
+        player_position: np.ndarray,
+        player_market_value: np.ndarray,
+        team_names: Sequence[str],
+    ):
+        """Performance of all players with one array entry per match.
+
+        Args:
+            points (np.ndarray): Points of the match.
+            minutes (np.ndarray): Minutes played in the match.
+            player (np.ndarray): Index of the player into player_ids.
+            season (np.ndarray): First year of the season of the match, 0 if unknown.
+            player_ids (list): ID of every player.
+            player_names (list): Name of every player.
+            player_team (np.ndarray): Index of the player's team into team_names.
+            player_position (np.ndarray): Kickbase position of every player (1 goalkeeper to 4 forward).
+            player_market_value (np.ndarray): Market value of every player.
+            team_names (list): Name of every team.
+        """
+        self.points = points
+        self.minutes = minutes
+        self.player = player
+        self.season = season
+        self.player_ids = list(player_ids)
+        self.player_names = list(player_names)
+        self.player_team = player_team
+        self.player_position = player_position
+        self.player_market_value = player_market_value
+        self.team_names = list(team_names)
+        self.team = player_team[player]  # Team of the player in every match
+        self.ppm = np.divide(
+            points, minutes, out=np.zeros_like(points), where=minutes > 0
+        )
+        self._index = {player_id: i for i, player_id in enumerate(self.player_ids)}
+        self._cache: dict[tuple, object] = {}
+
+    @classmethod
+    def from_performance(cls, player_data: dict[str, dict]) -> "PerformanceData":
+        """Build the arrays from the player performance in the format of Store.player_performance.
+
+        Matches are (points, minutes, season) entries, older data without the season is kept with season 0.
+        """
+        team_index: dict[str, int] = {}
+        player_ids, names, teams, positions, market_values = [], [], [], [], []
+        matches, counts = [], []
+        for player_id, player in player_data.items():
+            player_ids.append(str(player_id))
+            names.append(player.get("name", ""))
+            teams.append(team_index.setdefault(player.get("team", ""), len(team_index)))
+            positions.append(player.get("position") or 0)
+            market_values.append(player.get("market_value") or 0)
+            rows = np.asarray(player.get("points_and_minutes") or [], dtype=np.float64)
+            rows = rows.reshape(len(rows), -1) if len(rows) else np.zeros((0, 3))
+            if rows.shape[1] == 2:
+                rows = np.column_stack((rows, np.zeros(len(rows))))
+            matches.append(rows[:, :3])
+            counts.append(len(rows))
+        flat = np.concatenate(matches) if matches else np.zeros((0, 3))
+        return cls(
+            points=flat[:, 0].copy(),
+            minutes=flat[:, 1].copy(),
+            player=np.repeat(np.arange(len(player_ids), dtype=np.int32), counts),
+            season=flat[:, 2].astype(np.int16),
+            player_ids=player_ids,
+            player_names=names,
+            player_team=np.asarray(teams, dtype=np.int32),
+            player_position=np.asarray(positions, dtype=np.int8),
+            player_market_value=np.asarray(market_values, dtype=np.int64),
+            team_names=list(team_index),
+        )
+
+    @classmethod
+    def from_store(cls, store) -> "PerformanceData":
+        return cls.from_performance(store.player_performance())
+
+    @classmethod
+    def load(
+        cls, directory: Optional[str] = None, mmap: bool = True
+    ) -> Optional["PerformanceData"]:
+        """Load the columns written by save, memory-mapped, None if there are none."""
+        columns = load_columns(directory or state_path(PERFORMANCE_DIR), mmap)
+        if not columns:
+            return None
+        data = cls(
+            points=columns["points"],
+            minutes=columns["minutes"],
+            player=columns["player"],
+            season=columns["season"],
+            player_ids=columns["player_ids"].tolist(),
+            player_names=columns["player_names"].tolist(),
+            player_team=columns["player_team"],
+            player_position=columns["player_position"],
+            player_market_value=columns["player_market_value"],
+            team_names=columns["team_names"].tolist(),
+        )
+        for by in PRECOMPUTED:
+            name = by or "all"
+            if f"percentiles_{name}" in columns:
+                data._cache[("percentiles", PERCENTILES, by)] = columns[
+                    f"percentiles_{name}"
+                ]
+            if f"histogram_{name}" in columns:
+                data._cache[("histogram", HISTOGRAM_BINS, by, None)] = (
+                    columns[f"histogram_{name}"],
+                    columns[f"histogram_edges_{name}"],
+                )
+        return data
+
+    @classmethod
+    def open(cls, store, directory: Optional[str] = None) -> "PerformanceData":
+        """Load the columnar copy of the performance, built from the store if there is none."""
+        return cls.load(directory) or cls.from_store(store)
+
+    def save(self, directory: Optional[str] = None) -> None:
+        """Write the columns with the precomputed percentiles and histograms of the groups."""
+        statistics = {}
+        for by in PRECOMPUTED:
+            name = by or "all"
+            statistics[f"percentiles_{name}"] = self.percentiles(by=by)
+            counts, edges = self.histogram(by=by)
+            statistics[f"histogram_{name}"] = counts
+            statistics[f"histogram_edges_{name}"] = edges
+        save_columns(
+            directory or state_path(PERFORMANCE_DIR),
+            {
+                "points": self.points,
+                "minutes": self.minutes,
+                "player": self.player,
+                "season": self.season,
+                "player_ids": np.array(self.player_ids, dtype=str),
+                "player_names": np.array(self.player_names, dtype=str),
+                "player_team": self.player_team,
+                "player_position": self.player_position,
+                "player_market_value": self.player_market_value,
+                "team_names": np.array(self.team_names, dtype=str),
+                **statistics,
+            },
+        )
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def player_index(self, player_id) -> Optional[int]:
+        return self._index.get(str(player_id))
+
+    def groups(self, by: str) -> tuple[np.ndarray, list]:
+        """Return the group of every match and the labels of the groups.
+
+        Args:
+            by (str): One of "player", "team", "position" or "season".
+        """
+        if by == "player":
+            return self.player, self.player_ids
+        if by == "team":
+            return self.team, self.team_names
+        if by == "position":
+            labels, codes = np.unique(
+                self.player_position[self.player], return_inverse=True
+            )
+        elif by == "season":
+            labels, codes = np.unique(self.season, return_inverse=True)
+        else:
+            raise ValueError(f"Unknown group {by!r}, expected one of {GROUPS}")
+        return codes, labels.tolist()
+
+    def _cached(self, key: tuple, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def aggregate(self, by: str = "team") -> dict[str, np.ndarray]:
+        """Sum up the matches of every group.
+
+        Returns:
+            dict: labels, matches, points, minutes, ppm (points / minutes of the group) and
+                mean_ppm (mean of the match PPMs) per group.
+        """
+
+        def compute():
+            codes, labels = self.groups(by)
+            n = len(labels)
+            matches = np.bincount(codes, minlength=n)
+            points = np.bincount(codes, weights=self.points, minlength=n)
+            minutes = np.bincount(codes, weights=self.minutes, minlength=n)
+            ppm_sum = np.bincount(codes, weights=self.ppm, minlength=n)
+            return {
+                "labels": labels,
+                "matches": matches,
+                "points": points,
+                "minutes": minutes,
+                "ppm": np.divide(points, minutes, out=np.zeros(n), where=minutes > 0),
+                "mean_ppm": np.divide(
+                    ppm_sum, matches, out=np.zeros(n), where=matches > 0
+                ),
+            }
+
+        return self._cached(("aggregate", by), compute)
+
+    def percentiles(
+        self, q: Sequence[float] = PERCENTILES, by: Optional[str] = None
+    ) -> np.ndarray:
+        """Percentiles of the match PPMs, linearly interpolated like np.percentile.
+
+        Args:
+            q (list): Percentiles to compute, between 0 and 100.
+            by (str): Group to compute them for, all matches if not given.
+
+        Returns:
+            np.ndarray: Shape (len(q),) or (groups, len(q)), NaN for groups without matches.
+        """
+
+        def compute():
+            if by is None:
+                return (
+                    np.percentile(self.ppm, q) if len(self) else np.full(len(q), np.nan)
+                )
+            codes, labels = self.groups(by)
+            counts = np.bincount(codes, minlength=len(labels))
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            ### Sort by group, then by PPM, so every group is a sorted slice
+            ordered = self.ppm[np.lexsort((self.ppm, codes))]
+            position = starts[:, None] + np.asarray(q) / 100 * (counts[:, None] - 1)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.ceil(position).astype(np.int64)
+            valid = counts > 0
+            lower[~valid] = upper[~valid] = 0
+            if not len(ordered):
+                return np.full((len(labels), len(q)), np.nan)
+            result = ordered[lower] + (ordered[upper] - ordered[lower]) * (
+                position - lower
+            )
+            result[~valid] = np.nan
+            return result
+
+        return self._cached(("percentiles", tuple(q), by), compute)
+
+    def histogram(
+        self,
+        bins: int = HISTOGRAM_BINS,
+        by: Optional[str] = None,
+        value_range: Optional[tuple[float, float]] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Histogram of the match PPMs with the same bin edges for every group.
+
+        Returns:
+            tuple: Counts of shape (bins,) or (groups, bins) and the bin edges.
+        """
+
+        def compute():
+            edges = np.histogram_bin_edges(self.ppm, bins, value_range)
+            if by is None:
+                return np.histogram(self.ppm, edges)[0], edges
+            codes, labels = self.groups(by)
+            inside = (self.ppm >= edges[0]) & (self.ppm <= edges[-1])
+            ### The last bin includes its right edge like np.histogram
+            bin_index = np.clip(
+                np.searchsorted(edges, self.ppm[inside], side="right") - 1, 0, bins - 1
+            )
+            counts = np.bincount(
+                codes[inside] * bins + bin_index, minlength=len(labels) * bins
+            )
+            return counts.reshape(len(labels), bins), edges
+
+        return self._cached(("histogram", bins, by, value_range), compute)
@@ -0,0 +1,117 @@
+from dotenv import load_dotenv
+from datetime import datetime, timezone
+from typing import Optional
+from .call_api import ApiError, KickbaseClient, TOKEN_REFRESH_MARGIN
+from .state import state_path
+import json
+import os
+
+# The login response is cached here so following runs can reuse the token until it expires
+CREDENTIALS_FILE = ".kickbase_credentials.json"
+
+
+class User:
+    def __init__(self, req_response: dict):
+        self.leagues = req_response.get("srvl", [])
+        self.token: str = req_response.get("tkn", "")
+        self.token_expiry = parse_expiry(req_response.get("tknex"))
+        user_dict = req_response.get("u", {})
+        self.id = user_dict.get("id")
+        self.name = user_dict.get("name")
+        self.email = user_dict.get("email")
+
+
+def parse_expiry(tknex: Optional[str]) -> Optional[datetime]:
+    """Parse the token expiry of the login response, None if it is missing or unknown."""
+    if not tknex:
+        return None
+    try:
+        expiry = datetime.fromisoformat(tknex.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return expiry if expiry.tzinfo else expiry.replace(tzinfo=timezone.utc)
+
+
+def load_credentials(filename: str, email: Optional[str]) -> Optional[dict]:
+    """Return the cached login response of the account if its token is still valid for a while."""
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("email") != email:
+        return None
+    response = cached.get("response", {})
+    expiry = parse_expiry(response.get("tknex"))
+    if not response.get("tkn") or expiry is None:
+        return None
+    if datetime.now(timezone.utc) >= expiry - TOKEN_REFRESH_MARGIN:
+        return None
+    return response
+
+
+def save_credentials(filename: str, email: Optional[str], response: dict) -> None:
+    """Cache the login response, readable only by the current user since it holds the token."""
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"email": email, "response": response}, f)
+
+
+def login(
+    client: Optional[KickbaseClient] = None,
+    credentials_file: Optional[str] = CREDENTIALS_FILE,
+    force: bool = False,
+) -> User:
+    """Login the user with enviroment set email and password.
+
+    A cached token is reused until shortly before it expires. The client is set up to log in
+    again by itself when its token expires or gets rejected.
+
+    Args:
+        client (KickbaseClient): Client to log in, its token is set on success.
+        credentials_file (str): File caching the login response, None disables the cache. Other
+            API servers than Kickbase's get their own file.
+        force (bool): Log in even if the cached token is still valid.
+
+    Returns:
+        dict: User object containing user details.
+    Raises:
+        ApiError: If the login fails.
+    """
+    client = client or KickbaseClient()
+    if credentials_file:
+        credentials_file = state_path(credentials_file, client.base_url)
+    load_dotenv()  # Email and password may come from a .env file
+    email = os.getenv("EMAIL")
+    data = None
+    if credentials_file and not force:
+        data = load_credentials(credentials_file, email)
+
+    if data is None:
+        url = "/v4/user/login"
+        # JSON payload for the request
+        # user needs to add email and password
+
+        payload = {
+            "em": email,
+            "loy": False,
+            "pass": os.getenv("PASSWORD"),
+            "rep": {},
+        }
+
+        # sending the POST request through the shared session
+        response = client.post(url, authenticate=False, json=payload)
+        # Extracting the token from the response JSON
+        if response.status_code != 200:
+            raise ApiError(
+                f"Login failed: {response.status_code} - {response.text}",
+                response.status_code,
+            )
+        data = response.json()
+        if credentials_file:
+            save_credentials(credentials_file, email, data)
+
+    user = User(data)
+    client.set_token(user.token, user.token_expiry)
+    client.reauthenticate = lambda: login(client, credentials_file, force=True)
+    return user
@@ -0,0 +1,114 @@
+# Persistent cache for API responses so repeated runs don't download the same history again.
+# Every endpoint class has its own time to live, finished data (e.g. closed match days) never expires.
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from .state import state_path
+
+NO_CACHE = 0
+NEVER_EXPIRE = -1
+DAILY = -2  # Expires at the next midnight
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+# First matching pattern wins, unknown endpoints are not cached
+DEFAULT_POLICY: list[tuple[str, float]] = [
+    (r"/activitiesFeed/", NO_CACHE),
+    (r"/ranking/", 10 * MINUTE),  # Closed match days are requested with NEVER_EXPIRE
+    (r"/matchdays", HOUR),
+    (r"/marketValue/\d+", DAILY),
+    (r"/performance", DAILY),
+    (r"/teamprofile", DAILY),
+    (r"/competitions/\d+/players/\d+\?", DAILY),  # Player profile
+    (r"/overview", 5 * MINUTE),
+    (r"/managers/\d+/(dashboard|squad|transfer)", 5 * MINUTE),
+]
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        filename: Optional[str] = None,
+        policy: Optional[list[tuple[str, float]]] = None,
+    ):
+        ### Responses are cached by path, so every API server needs its own file
+        self.filename = filename or state_path("api_cache.sqlite")
+        self.policy = [
+            (re.compile(pattern), ttl) for pattern, ttl in (policy or DEFAULT_POLICY)
+        ]
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.filename, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, body TEXT NOT NULL, expires_at REAL)"
+        )
+        self._db.commit()
+
+    def ttl_for(self, url: str) -> float:
+        """Return the time to live in seconds for the given URL according to the policy."""
+        for pattern, ttl in self.policy:
+            if pattern.search(url):
+                return ttl
+        return NO_CACHE
+
+    def get(self, url: str, ttl: Optional[float] = None) -> Optional[str]:
+        """Return the cached JSON body for the URL or None if it is missing or expired.
+
+        Args:
+            url (str): API endpoint URL
+            ttl (float): Overrides the policy of the endpoint, NO_CACHE skips the cache.
+        """
+        if (self.ttl_for(url) if ttl is None else ttl) == NO_CACHE:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, expires_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row and (row[1] is None or row[1] > time.time()):
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+        return None
+
+    def set(self, url: str, body: bytes | str, ttl: Optional[float] = None) -> None:
+        """Store the JSON body of the response for the URL as sent, honouring the policy or the given ttl."""
+        ttl = self.ttl_for(url) if ttl is None else ttl
+        if ttl == NO_CACHE:
+            return
+        if ttl == NEVER_EXPIRE:
+            expires_at = None
+        elif ttl == DAILY:
+            tomorrow = datetime.now().date() + timedelta(days=1)
+            expires_at = datetime.combine(tomorrow, datetime.min.time()).timestamp()
+        else:
+            expires_at = time.time() + ttl
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (url, body, expires_at) VALUES (?, ?, ?)",
+                (
+                    url,
+                    body.decode("utf-8") if isinstance(body, bytes) else body,
+                    expires_at,
+                ),
+            )
+            self._db.commit()
+
+    def invalidate(self, prefix: str) -> int:
+        """Remove the cached responses of all URLs starting with the prefix. Returns their number."""
+        with self._lock:
+            removed = self._db.execute(
+                "DELETE FROM responses WHERE substr(url, 1, ?) = ?",
+                (len(prefix), prefix),
+            ).rowcount
+            self._db.commit()
+        return removed
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,228 @@
+# Boilerplate code since we will call the api a lot
+# Expects url to call and data format to return in
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+import msgspec
+import requests
+from requests.adapters import HTTPAdapter
+from .cache import NO_CACHE, ResponseCache
+from .cassette import Cassette
+from .metrics import Metrics
+from .retry import RetryPolicy
+from .state import api_url
+
+# Tokens are renewed this long before they expire
+TOKEN_REFRESH_MARGIN = timedelta(minutes=10)
+
+
+class ApiError(Exception):
+    """Raised when an API call failed for good, i.e. after all retries."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class KickbaseClient:
+    """Shared HTTP client for all Kickbase API calls.
+
+    Keeps one pooled requests.Session alive so connections (and their TLS handshakes)
+    are reused between calls, and holds the kkstrauth token and the response cache.
+    If a reauthenticate callback is set (auth.login does that), the token is renewed
+    shortly before it expires and whenever the API answers with 401.
+    Throttled and failed requests are retried according to the retry policy.
+    Every request and cache lookup is counted in the metrics of the client.
+    With a cassette the requests are recorded, or replayed from it without network access.
+    """
+
+    def __init__(
+        self,
+        token: str = "",
+        cache: Optional[ResponseCache] = None,
+        base_url: Optional[str] = None,
+        pool_size: int = 16,
+        retry: Optional[RetryPolicy] = None,
+        metrics: Optional[Metrics] = None,
+        cassette: Optional[Cassette] = None,
+    ):
+        ### KICKBASE_API_URL points the client to another server, e.g. the benchmark stub
+        self.base_url = (base_url or api_url()).rstrip("/")
+        self.cache = cache
+        self.retry = retry or RetryPolicy()
+        self.metrics = metrics or Metrics()
+        self.cassette = cassette
+        if cassette and cassette.replaying:
+            ### Backoffs and circuit cooldowns of a replay run at its speed
+            self.retry.sleep = cassette.sleep
+            self.retry.clock = cassette.clock
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {"Content-Type": "application/json", "Accept": "application/json"}
+        )
+        self.token = ""
+        self.token_expiry: Optional[datetime] = None
+        self.reauthenticate: Optional[Callable[[], object]] = None
+        self._auth_lock = threading.Lock()
+        if token:
+            self.set_token(token)
+
+    def set_token(self, token: str, expiry: Optional[datetime] = None) -> None:
+        """Set the kkstrauth token sent with every following request and when it expires."""
+        self.token = token
+        self.token_expiry = expiry
+        self.session.headers["Cookie"] = f"kkstrauth={token};"
+
+    def token_expires_soon(self) -> bool:
+        ### Replayed tokens expired long ago, recorded 401s still trigger a new login
+        if self.cassette and self.cassette.replaying:
+            return False
+        return (
+            self.token_expiry is not None
+            and datetime.now(timezone.utc) >= self.token_expiry - TOKEN_REFRESH_MARGIN
+        )
+
+    def refresh_token(self, stale_token: str) -> None:
+        """Log in again unless another thread already replaced the stale token."""
+        with self._auth_lock:
+            if self.token == stale_token and self.reauthenticate:
+                self.reauthenticate()
+
+    def url(self, url: str) -> str:
+        """Prefix API paths like /v4/... with the base URL, full URLs are kept."""
+        return self.base_url + url if url.startswith("/") else url
+
+    def request(
+        self, method: str, url: str, authenticate: bool = True, **kwargs
+    ) -> requests.Response:
+        """Send the request, renewing the token before it expires and retrying once on 401.
+
+        Args:
+            method (str): HTTP method
+            url (str): API endpoint URL or path
+            authenticate (bool): Whether the token may be renewed, False for the login itself.
+        """
+        if authenticate and self.reauthenticate and self.token_expires_soon():
+            self.refresh_token(self.token)
+        token = self.token
+        response = self.send(method, url, **kwargs)
+        if response.status_code == 401 and authenticate and self.reauthenticate:
+            self.refresh_token(token)
+            response = self.send(method, url, **kwargs)
+        return response
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        url = self.url(url)
+        return self.retry.send(lambda: self.attempt(method, url, **kwargs), url)
+
+    def attempt(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send the request once, or replay it from the cassette, and count it in the metrics."""
+        path = url.removeprefix(self.base_url)
+        start = time.perf_counter()
+        try:
+            if self.cassette and self.cassette.replaying:
+                response = self.cassette.play(method, path, url)
+            else:
+                response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            self.metrics.record_request(url, None, time.perf_counter() - start, 0)
+            raise
+        elapsed = time.perf_counter() - start
+        if self.cassette and self.cassette.recording:
+            self.cassette.record(method, path, response, elapsed)
+        self.metrics.record_request(
+            url, response.status_code, elapsed, len(response.content)
+        )
+        return response
+
+    def cached(self, url: str, ttl: Optional[float] = None) -> Optional[str]:
+        """Look the raw response body of the URL up in the cache, counting hits and misses of cacheable endpoints."""
+        if not self.cache:
+            return None
+        body = self.cache.get(url, ttl)
+        if (self.cache.ttl_for(url) if ttl is None else ttl) != NO_CACHE:
+            self.metrics.record_cache(url, body is not None)
+        return body
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+        if self.cache:
+            self.cache.close()
+
+
+def call_api(
+    client: KickbaseClient,
+    url: str,
+    return_format: Optional[dict] = None,
+    ttl: Optional[float] = None,
+    model: Optional[type] = None,
+) -> Any:
+    """Call the API with the given client and URL, returning the response data.
+
+    Args:
+        client (KickbaseClient): Logged in API client
+        url (str): API endpoint URL or path
+        return_format (dict): Expected format of the response data. If not specified, returns json response.
+        ttl (float): Time to live of the cached response, overrides the cache policy of the endpoint.
+        model (type): Decode the response into this typed record of models.py instead of dicts.
+
+    Raises:
+        ApiError: If there is an error calling the API.
+
+    Returns:
+        dict: The response data in the expected format, an instance of the model if one is given.
+    """
+    body = client.cached(url, ttl)
+    if body is None:
+        data = fetch_json(client, url, ttl, model)
+    else:
+        data = decode(body, model)
+    return data if model else select_format(data, return_format)
+
+
+def fetch_json(
+    client: KickbaseClient,
+    url: str,
+    ttl: Optional[float] = None,
+    model: Optional[type] = None,
+) -> Any:
+    """Request the URL without looking at the cache and store the response in it."""
+    try:
+        response = client.get(url)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        status = e.response.status_code if e.response is not None else None
+        raise ApiError(f"Error calling API: {e}", status) from e
+    data = decode(response.content, model)
+    if client.cache:
+        ### The body is cached as sent, so cache hits are decoded the same way
+        client.cache.set(url, response.content, ttl)
+    return data
+
+
+def decode(body: bytes | str, model: Optional[type] = None) -> Any:
+    """Parse a JSON response body, straight into the typed model if one is given.
+
+    Raises:
+        ApiError: If the body is no valid JSON or doesn't match the model.
+    """
+    try:
+        return msgspec.json.decode(body, type=model or Any)
+    except msgspec.DecodeError as e:
+        raise ApiError(f"Invalid API response: {e}") from e
+
+
+def select_format(data: dict, return_format: Optional[dict] = None) -> dict:
+    if return_format:
+        return {key: data.get(key) for key in return_format}
+    return data
@@ -0,0 +1,148 @@
+# Record and replay of the API traffic of a run, to reproduce slow refreshes offline.
+# A cassette is a gzipped JSON lines file: a header line, then one line per request with the response and its latency.
+import gzip
+import json
+import threading
+import time
+from datetime import datetime
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_VERSION = 1
+RECORDED_HEADERS = ("Content-Type", "Retry-After")
+LOGIN_PATH = "/v4/user/login"
+
+
+class CassetteMissError(requests.exceptions.RequestException):
+    """Raised when a replayed run sends a request that is not on the cassette."""
+
+
+class Cassette:
+    def __init__(self, filename: str, mode: str = "replay", speed: float = 1.0):
+        """Records every request of the client or replays the recorded responses.
+
+        Replays serve the responses of a URL in the recorded order (the last one repeats)
+        after the recorded latency. The store and the response cache decide which requests
+        a run sends, so replay in a copy of the working directory taken before the recording.
+
+        Args:
+            filename (str): Cassette file, e.g. refresh.jsonl.gz.
+            mode (str): "record" or "replay"
+            speed (float): Replay latencies and retry backoffs this many times faster, 0 replays
+                without waiting.
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.filename = filename
+        self.mode = mode
+        self.speed = speed
+        self.entries: list[dict] = []
+        self.skipped = 0.0  # Seconds of waiting the replay left out
+        self._lock = threading.Lock()
+        self._played: dict[tuple[str, str], int] = {}
+        self._responses: dict[tuple[str, str], list[dict]] = {}
+        if self.replaying:
+            self.load()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def record(
+        self, method: str, path: str, response: requests.Response, elapsed: float
+    ) -> None:
+        """Add the response to the cassette.
+
+        Args:
+            method (str): HTTP method
+            path (str): Requested path relative to the base URL of the client.
+            response (requests.Response): The response of the API.
+            elapsed (float): Latency of the request in seconds.
+        """
+        body = response.text
+        if path == LOGIN_PATH and response.status_code == 200:
+            ### The token must not end up in the cassette, replays don't need a valid one
+            data = response.json()
+            data["tkn"] = "replayed"
+            body = json.dumps(data)
+        entry = {
+            "method": method,
+            "path": path,
+            "status": response.status_code,
+            "headers": {
+                name: response.headers[name]
+                for name in RECORDED_HEADERS
+                if name in response.headers
+            },
+            "elapsed": round(elapsed, 4),
+            "body": body,
+        }
+        with self._lock:
+            self.entries.append(entry)
+
+    def play(self, method: str, path: str, url: str) -> requests.Response:
+        """Return the next recorded response of the request after its recorded latency.
+
+        Raises:
+            CassetteMissError: If the request was not recorded.
+        """
+        key = (method, path)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise CassetteMissError(f"{method} {path} is not on {self.filename}")
+            index = self._played.get(key, 0)
+            self._played[key] = index + 1
+        entry = responses[min(index, len(responses) - 1)]
+        self.sleep(entry["elapsed"])
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = url
+        response.reason = "Replayed"
+        return response
+
+    def sleep(self, seconds: float) -> None:
+        """Wait the given time scaled by the replay speed, the clock still moves on by all of it."""
+        wait = seconds / self.speed if self.speed else 0.0
+        with self._lock:
+            self.skipped += seconds - wait
+        if wait:
+            time.sleep(wait)
+
+    def clock(self) -> float:
+        """Monotonic time of the replay, as if every wait had taken its unscaled time."""
+        with self._lock:
+            return time.monotonic() + self.skipped
+
+    def load(self) -> None:
+        with gzip.open(self.filename, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(
+                    f"Unsupported cassette version {header.get('version')} in {self.filename}"
+                )
+            self.entries = [json.loads(line) for line in f]
+        for entry in self.entries:
+            self._responses.setdefault((entry["method"], entry["path"]), []).append(
+                entry
+            )
+
+    def save(self) -> None:
+        with self._lock:
+            entries = list(self.entries)
+        with gzip.open(self.filename, "wt", encoding="utf-8") as f:
+            header = {
+                "version": CASSETTE_VERSION,
+                "recorded": datetime.now().isoformat(timespec="seconds"),
+                "requests": len(entries),
+            }
+            f.write(json.dumps(header) + "\n")
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
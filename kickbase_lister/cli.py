@@ -0,0 +1,131 @@
+"""Command line interface of the Kickbase Lister: python -m kickbase_lister <command>
+
+    report   Create the styled tables of the leagues
+    serve    Keep the tables up to date and serve them over HTTP
+    crawl    Crawl the performance of all players for the expected points
+    plot     Plot the points per minute of all players per team
+
+The module of a command is only imported when the command runs, so every command
+pays only for the libraries it uses (e.g. matplotlib only for plot).
+"""
+
+import argparse
+import importlib
+import logging
+from types import ModuleType
+from typing import Optional
+
+DEFAULT_LEAGUES = ["Alex stinkt 25/26"]
+COMMANDS = {
+    "report": "kickbase_lister.user_list",
+    "serve": "kickbase_lister.service",
+    "crawl": "kickbase_lister.player_analyze",
+    "plot": "kickbase_lister.graph",
+}
+
+
+def load_command(name: str) -> ModuleType:
+    """Import the module implementing the command."""
+    return importlib.import_module(COMMANDS[name])
+
+
+def run_report(args: argparse.Namespace) -> None:
+    cassette = None
+    if args.record or args.replay:
+        from .cassette import Cassette
+
+        if args.record:
+            cassette = Cassette(args.record, "record")
+        else:
+            cassette = Cassette(args.replay, "replay", args.speed)
+    load_command("report").main(
+        None if args.all else args.leagues, args.workers, cassette=cassette
+    )
+
+
+def run_serve(args: argparse.Namespace) -> None:
+    load_command("serve").serve(
+        None if args.all else args.leagues,
+        args.interval,
+        args.host,
+        args.port,
+        args.metrics,
+    )
+
+
+def run_crawl(args: argparse.Namespace) -> None:
+    load_command("crawl").analyze_players()
+
+
+def run_plot(args: argparse.Namespace) -> None:
+    load_command("plot").plot_all_player_performance()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m kickbase_lister",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report = commands.add_parser("report", help="Create the Kickbase stats tables")
+    report.add_argument(
+        "leagues",
+        nargs="*",
+        default=DEFAULT_LEAGUES,
+        help="Names of the leagues to create tables for",
+    )
+    report.add_argument(
+        "--all", action="store_true", help="Create tables for all leagues of the user"
+    )
+    report.add_argument(
+        "--workers", type=int, default=4, help="Number of leagues processed at once"
+    )
+    report.add_argument(
+        "--record", metavar="CASSETTE", help="Record the API traffic to this file"
+    )
+    report.add_argument(
+        "--replay",
+        metavar="CASSETTE",
+        help="Replay the API traffic recorded in this file instead of calling the API",
+    )
+    report.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Replay the recorded latencies, request rate and retry backoffs this many times faster, 0 for no waiting",
+    )
+    report.set_defaults(run=run_report)
+
+    serve = commands.add_parser("serve", help="Refresh and serve the tables")
+    serve.add_argument("leagues", nargs="*", default=DEFAULT_LEAGUES)
+    serve.add_argument(
+        "--all", action="store_true", help="Serve all leagues of the user"
+    )
+    serve.add_argument(
+        "--interval", type=float, default=300, help="Seconds between polls"
+    )
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument(
+        "--metrics", action="store_true", help="Serve Prometheus metrics on /metrics"
+    )
+    serve.set_defaults(run=run_serve)
+
+    crawl = commands.add_parser(
+        "crawl", help="Crawl the performance of all players, resumes interrupted crawls"
+    )
+    crawl.set_defaults(run=run_crawl)
+
+    plot = commands.add_parser("plot", help="Plot the points per minute per team")
+    plot.set_defaults(run=run_plot)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    args.run(args)
@@ -0,0 +1,150 @@
+# Columnar on-disk copies of the history in the store: one .npy file per column, memory-mapped on load,
+# so analytics and lookups don't parse JSON or query SQLite row by row.
+# The store stays the source of truth, the columns are rebuilt from it after new data was saved.
+import os
+import shutil
+from typing import Optional
+import numpy as np
+from .state import state_path
+from .store import Store
+
+HISTORY_DIR = "history"
+MARKET_VALUES_DIR = os.path.join(HISTORY_DIR, "market_values")
+PERFORMANCE_DIR = os.path.join(HISTORY_DIR, "performance")
+
+
+def save_columns(directory: str, columns: dict[str, np.ndarray]) -> None:
+    """Write every column to directory/<name>.npy, replacing the old columns all at once."""
+    tmp = directory + ".tmp"
+    old = directory + ".old"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for name, column in columns.items():
+        np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(column))
+    shutil.rmtree(old, ignore_errors=True)
+    if os.path.exists(directory):
+        os.replace(directory, old)
+    os.replace(tmp, directory)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def load_columns(directory: str, mmap: bool = True) -> Optional[dict[str, np.ndarray]]:
+    """Load the columns written by save_columns, None if there are none."""
+    if not os.path.isdir(directory):
+        return None
+    return {
+        filename[: -len(".npy")]: np.load(
+            os.path.join(directory, filename), mmap_mode="r" if mmap else None
+        )
+        for filename in os.listdir(directory)
+        if filename.endswith(".npy")
+    }
+
+
+class MarketValueHistory:
+    def __init__(
+        self,
+        player_ids: np.ndarray,
+        offsets: np.ndarray,
+        days: np.ndarray,
+        values: np.ndarray,
+        fetched_on: np.ndarray,
+    ):
+        """Market values of all players sorted by player and day.
+
+        Args:
+            player_ids (np.ndarray): Sorted IDs of the players.
+            offsets (np.ndarray): The days and values of player i are at offsets[i]:offsets[i + 1].
+            days (np.ndarray): Day numbers since 1970-01-01.
+            values (np.ndarray): Market value on the day.
+            fetched_on (np.ndarray): Day number the series of the player was last fetched on, 0 if unknown.
+        """
+        self.player_ids = player_ids
+        self.offsets = offsets
+        self.days = days
+        self.values = values
+        self.fetched_on = fetched_on
+
+    @classmethod
+    def from_store(
+        cls, store: Store, fetched_on: Optional[dict[int, int]] = None
+    ) -> "MarketValueHistory":
+        """Build the columns from all market values in the store.
+
+        Args:
+            store (Store): Local database with the market values.
+            fetched_on (dict): Day number the series of a player was last fetched on.
+        """
+        rows = np.array(store.market_value_rows(), dtype=np.int64).reshape(-1, 3)
+        player_ids, starts = np.unique(rows[:, 0], return_index=True)
+        fetched_on = fetched_on or {}
+        return cls(
+            player_ids,
+            np.append(starts, len(rows)),
+            rows[:, 1].astype(np.int32),
+            rows[:, 2],
+            np.array(
+                [fetched_on.get(player_id, 0) for player_id in player_ids.tolist()],
+                dtype=np.int32,
+            ),
+        )
+
+    @classmethod
+    def load(
+        cls, directory: Optional[str] = None, mmap: bool = True
+    ) -> Optional["MarketValueHistory"]:
+        columns = load_columns(directory or state_path(MARKET_VALUES_DIR), mmap)
+        if not columns:
+            return None
+        return cls(
+            columns["player_ids"],
+            columns["offsets"],
+            columns["days"],
+            columns["values"],
+            columns["fetched_on"],
+        )
+
+    def save(self, directory: Optional[str] = None) -> None:
+        save_columns(
+            directory or state_path(MARKET_VALUES_DIR),
+            {
+                "player_ids": self.player_ids,
+                "offsets": self.offsets,
+                "days": self.days,
+                "values": self.values,
+                "fetched_on": self.fetched_on,
+            },
+        )
+
+    def _index(self, player_id) -> Optional[int]:
+        index = int(np.searchsorted(self.player_ids, int(player_id)))
+        if index == len(self.player_ids) or self.player_ids[index] != int(player_id):
+            return None
+        return index
+
+    def _slice(self, player_id) -> Optional[slice]:
+        index = self._index(player_id)
+        if index is None:
+            return None
+        return slice(int(self.offsets[index]), int(self.offsets[index + 1]))
+
+    def fetched_on_days(self) -> dict[int, int]:
+        return {
+            player_id: day
+            for player_id, day in zip(
+                self.player_ids.tolist(), self.fetched_on.tolist()
+            )
+            if day
+        }
+
+    def fetched_since(self, player_id, day: int) -> bool:
+        """Whether the series of the player was fetched on the given day or later."""
+        index = self._index(player_id)
+        return index is not None and int(self.fetched_on[index]) >= day
+
+    def series(self, player_id) -> Optional[dict[int, int]]:
+        """Market value of the player for every saved day, None if the player is unknown."""
+        rows = self._slice(player_id)
+        if rows is None:
+            return None
+        return dict(zip(self.days[rows].tolist(), self.values[rows].tolist()))
@@ -0,0 +1,151 @@
+# Concurrent fetching of many API calls at once, bounded by a concurrency limit and a rate limit.
+# Stages build a list of URLs and submit them as one batch instead of calling the API one after another.
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional
+from .call_api import KickbaseClient, decode, fetch_json, select_format
+
+
+class TokenBucket:
+    """Token bucket rate limiter, allows bursts of `capacity` requests and `rate` requests per second on average.
+
+    Thread safe so one bucket can be shared by batches running in different threads and event loops.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller has to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def acquire(self) -> None:
+        if wait := self.reserve():
+            await asyncio.sleep(wait)
+
+
+class FetchEngine:
+    def __init__(
+        self,
+        client: KickbaseClient,
+        concurrency: int = 8,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+    ):
+        """Fetch batches of URLs concurrently with the shared client.
+
+        Args:
+            client (KickbaseClient): Logged in API client
+            concurrency (int): Maximum number of requests in flight per batch.
+            rate (float): Maximum number of requests per second sent to the API (cache hits are free),
+                0 for no limit.
+            burst (float): Number of requests that may be sent at once before the rate applies.
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.limiter = TokenBucket(rate, burst) if rate else None
+
+    async def fetch(
+        self,
+        url: str,
+        semaphore: asyncio.Semaphore,
+        return_format: Optional[dict] = None,
+        ttl: Optional[float] = None,
+        model: Optional[type] = None,
+    ) -> Any:
+        body = self.client.cached(url, ttl)
+        if body is None:
+            async with semaphore:
+                if self.limiter:
+                    await self.limiter.acquire()
+                data = await asyncio.to_thread(fetch_json, self.client, url, ttl, model)
+        else:
+            data = decode(body, model)
+        return data if model else select_format(data, return_format)
+
+    async def gather(
+        self,
+        urls: list[str],
+        return_format: Optional[dict] = None,
+        ttl: Optional[float] = None,
+        return_exceptions: bool = False,
+        model: Optional[type] = None,
+    ) -> list:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(
+            *(self.fetch(url, semaphore, return_format, ttl, model) for url in urls),
+            return_exceptions=return_exceptions,
+        )
+
+    def map(
+        self,
+        urls: list[str],
+        return_format: Optional[dict] = None,
+        ttl: Optional[float] = None,
+        return_exceptions: bool = False,
+        model: Optional[type] = None,
+    ) -> list:
+        """Fetch all URLs and return the responses in the same order.
+
+        Args:
+            urls (list): API endpoint URLs or paths
+            return_format (dict): Expected format of every response, see call_api.
+            ttl (float): Time to live of the cached responses, overrides the cache policy.
+            return_exceptions (bool): Return failed calls as exceptions in the list instead of raising the first one.
+            model (type): Decode every response into this typed record of models.py, see call_api.
+
+        Returns:
+            list: The response data for every URL.
+        """
+        if not urls:
+            return []
+        return asyncio.run(
+            self.gather(urls, return_format, ttl, return_exceptions, model)
+        )
+
+
+def iter_pages(
+    fetch_page: Callable[[int], list],
+    page_size: int,
+    is_last: Optional[Callable[[list], bool]] = None,
+) -> Iterator[list]:
+    """Yield the pages of a paginated endpoint while the next page is fetched in the background.
+
+    Args:
+        fetch_page (callable): Returns the items of the page starting at the given offset.
+        page_size (int): Offset between two pages.
+        is_last (callable): Returns True if no page after the given one is needed.
+
+    Returns:
+        Iterator: The non-empty pages in order, paging stops at the first empty page.
+    """
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        start = 0
+        future = pool.submit(fetch_page, start)
+        try:
+            while page := future.result():
+                if is_last and is_last(page):
+                    future = None
+                else:
+                    start += page_size
+                    future = pool.submit(fetch_page, start)
+                yield page
+                if future is None:
+                    break
+        finally:
+            ### Don't wait for a page nobody asks for anymore
+            if future is not None:
+                future.cancel()
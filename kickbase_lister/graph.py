@@ -0,0 +1,27 @@
+from typing import Optional
+from .analytics import PerformanceData
+from .store import Store
+
+def plot_all_player_performance(performance: Optional[PerformanceData] = None):
+    """Plot the performance of all players based on their points per minute."""
+    import matplotlib.pyplot as plt
+    performance = performance or PerformanceData.open(Store())
+    if not len(performance):
+        print("No performance data available, run `python -m kickbase_lister crawl` first.")
+        return
+    # Same bins for every team, counted in one pass
+    counts, edges = performance.histogram(bins=50, by="team")
+    team_stats = performance.aggregate(by="team")
+
+    plt.figure(figsize=(10, 5))
+    for team, team_counts, mean_ppm in zip(team_stats["labels"], counts, team_stats["mean_ppm"]):
+        plt.stairs(team_counts, edges, fill=True, alpha=0.7, label=team)
+        # Plot mean as line 
+        plt.axvline(float(mean_ppm), linestyle='dashed', linewidth=1, label=f"{team} Mean PPM")
+    #plt.scatter(performance.minutes, performance.points, marker='o', linestyle='-', color='b')
+    plt.title("Player Performance: Points per Minute (All Players)")
+    plt.xlabel("Minutes Played")
+    plt.legend()
+    plt.ylabel("Points Scored")
+    plt.grid()
+    plt.show()
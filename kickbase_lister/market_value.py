@@ -0,0 +1,102 @@
+# Market value series of players, fetched once per player and run and shared by every stage.
+# The API returns the values of the last 365 days as a list of {dt, mv} where dt is the day number since 1970-01-01.
+import threading
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional
+from .fetch import FetchEngine
+from .models import MarketValues
+from .store import Store
+
+if TYPE_CHECKING:  # NumPy is only loaded when the history is saved
+    from .columnar import MarketValueHistory
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def date_to_day_number(date: str) -> int:
+    """Convert a date in the format DD.MM.YYYY to the day number used by the API."""
+    return (datetime.strptime(date, "%d.%m.%Y") - EPOCH).days
+
+
+def yesterday_day_number() -> int:
+    return (datetime.today() - timedelta(days=1) - EPOCH).days
+
+
+def today_day_number() -> int:
+    return (datetime.today() - EPOCH).days
+
+
+class MarketValueStore:
+
+    def __init__(
+        self,
+        engine: FetchEngine,
+        store: Optional[Store] = None,
+        history: Optional["MarketValueHistory"] = None,
+    ):
+        """Per run store of the market value series of every player, indexed by day number.
+
+        Args:
+            engine (FetchEngine): Engine used to fetch the series of missing players.
+            store (Store): Local database the fetched series are saved in for later analysis.
+            history (MarketValueHistory): Columnar history, series fetched today are read from it.
+        """
+        self.engine = engine
+        self.store = store
+        self.history = history
+        self._fetched: set = set()  # Players fetched from the API in this run
+        self._series: dict[int, dict[int, int]] = {}
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+
+    def prefetch(self, player_ids) -> None:
+        """Fetch the series of all given players that are not in the store yet, concurrently."""
+        ### Only one prefetch at a time so leagues processed in parallel don't fetch the same players
+        with self._fetch_lock:
+            missing = list({pid for pid in player_ids if pid not in self._series})
+            if self.history:
+                ### Series already fetched today are read from the columnar history
+                today = today_day_number()
+                known = {
+                    pid for pid in missing if self.history.fetched_since(pid, today)
+                }
+                with self._lock:
+                    for player_id in known:
+                        self._series[player_id] = self.history.series(player_id)
+                missing = [pid for pid in missing if pid not in known]
+            responses = self.engine.map(
+                [
+                    f"/v4/competitions/1/players/{player_id}/marketValue/365"
+                    for player_id in missing
+                ],
+                model=MarketValues,
+            )
+            with self._lock:
+                for player_id, data in zip(missing, responses):
+                    self._series[player_id] = {
+                        point.day: point.value for point in data.points
+                    }
+                self._fetched.update(missing)
+            if self.store:
+                for player_id in missing:
+                    self.store.save_market_values(player_id, self._series[player_id])
+
+    def save_history(self, directory: Optional[str] = None) -> None:
+        """Rebuild the columnar history from the store if new series were fetched in this run."""
+        if not self.store or not self._fetched:
+            return
+        from .columnar import MarketValueHistory
+
+        fetched_on = self.history.fetched_on_days() if self.history else {}
+        with self._lock:
+            fetched_on.update({int(pid): today_day_number() for pid in self._fetched})
+        self.history = MarketValueHistory.from_store(self.store, fetched_on)
+        self.history.save(directory)
+        with self._lock:
+            self._fetched.clear()
+
+    def series(self, player_id: int) -> dict[int, int]:
+        """Return the market value of the player for every day number of the last year."""
+        if player_id not in self._series:
+            self.prefetch([player_id])
+        return self._series[player_id]
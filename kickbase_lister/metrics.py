@@ -0,0 +1,188 @@
+# Instrumentation of a run: wall time per stage and count, bytes, latency and cache hits per API endpoint.
+# Written as a JSON run report after every run and served in the Prometheus text format by service.py.
+import json
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from urllib.parse import urlsplit
+
+RUN_REPORT_FILE = "run_report.json"
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Upper bounds in seconds
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_template(url: str) -> str:
+    """Group URLs by endpoint: drop host and query and replace numeric IDs, e.g. /v4/leagues/{id}/ranking."""
+    return _ID_SEGMENT.sub("/{id}", urlsplit(url).path)
+
+
+def log_event(name: str, level: int = logging.DEBUG, **fields) -> None:
+    """Log a structured event like `transfer_applied player=123 price=500000`.
+
+    The fields are only formatted if the level is enabled, so events are cheap in hot loops.
+    """
+    if logging.getLogger().isEnabledFor(level):
+        logging.log(
+            level,
+            "%s %s",
+            name,
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+        )
+
+
+def _new_endpoint() -> dict:
+    return {
+        "requests": 0,
+        "errors": 0,  # Connection errors and status codes >= 400
+        "bytes": 0,
+        "seconds": 0.0,
+        "buckets": [0] * (len(LATENCY_BUCKETS) + 1),  # Last bucket is +Inf
+        "statuses": {},
+        "cache_hits": 0,
+        "cache_misses": 0,
+    }
+
+
+class Metrics:
+    """Thread-safe counters of one run, shared by everything that uses the same client."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.stages: dict[str, dict] = {}
+        self.endpoints: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure the wall time of the block, stages run by several threads are summed up."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stage = self.stages.setdefault(
+                    name, {"runs": 0, "seconds": 0.0, "max_seconds": 0.0}
+                )
+                stage["runs"] += 1
+                stage["seconds"] += elapsed
+                stage["max_seconds"] = max(stage["max_seconds"], elapsed)
+
+    def _endpoint(self, url: str) -> dict:
+        template = endpoint_template(url)
+        endpoint = self.endpoints.get(template)
+        if endpoint is None:
+            endpoint = self.endpoints[template] = _new_endpoint()
+        return endpoint
+
+    def record_request(
+        self, url: str, status: Optional[int], seconds: float, size: int
+    ) -> None:
+        """Count one HTTP request sent to the API, retries are counted separately.
+
+        Args:
+            url (str): Requested URL
+            status (int): Status code of the response, None if no response arrived.
+            seconds (float): Latency of the request.
+            size (int): Bytes of the response body.
+        """
+        bucket = next(
+            (index for index, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        with self._lock:
+            endpoint = self._endpoint(url)
+            endpoint["requests"] += 1
+            endpoint["bytes"] += size
+            endpoint["seconds"] += seconds
+            endpoint["buckets"][bucket] += 1
+            key = str(status) if status is not None else "error"
+            endpoint["statuses"][key] = endpoint["statuses"].get(key, 0) + 1
+            if status is None or status >= 400:
+                endpoint["errors"] += 1
+
+    def record_cache(self, url: str, hit: bool) -> None:
+        with self._lock:
+            self._endpoint(url)["cache_hits" if hit else "cache_misses"] += 1
+
+    def report(self) -> dict:
+        """Snapshot of all counters as a JSON serializable dict."""
+        with self._lock:
+            endpoints = {
+                template: {
+                    **endpoint,
+                    "buckets": dict(
+                        zip(
+                            [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"],
+                            endpoint["buckets"],
+                        )
+                    ),
+                    "statuses": dict(endpoint["statuses"]),
+                }
+                for template, endpoint in sorted(self.endpoints.items())
+            }
+            stages = {name: dict(stage) for name, stage in self.stages.items()}
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "seconds": time.time() - self.started,
+            "requests": sum(endpoint["requests"] for endpoint in endpoints.values()),
+            "bytes": sum(endpoint["bytes"] for endpoint in endpoints.values()),
+            "cache_hits": sum(
+                endpoint["cache_hits"] for endpoint in endpoints.values()
+            ),
+            "stages": stages,
+            "endpoints": endpoints,
+        }
+
+    def save_report(self, filename: str = RUN_REPORT_FILE) -> dict:
+        report = self.report()
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return report
+
+    def prometheus(self) -> str:
+        """All counters in the Prometheus text exposition format."""
+        report = self.report()
+        lines = [
+            "# TYPE kickbase_stage_seconds_total counter",
+            *(
+                f'kickbase_stage_seconds_total{{stage="{name}"}} {stage["seconds"]}'
+                for name, stage in report["stages"].items()
+            ),
+            "# TYPE kickbase_stage_runs_total counter",
+            *(
+                f'kickbase_stage_runs_total{{stage="{name}"}} {stage["runs"]}'
+                for name, stage in report["stages"].items()
+            ),
+        ]
+        endpoints = report["endpoints"]
+        for metric, key in (
+            ("kickbase_api_requests_total", "requests"),
+            ("kickbase_api_errors_total", "errors"),
+            ("kickbase_api_response_bytes_total", "bytes"),
+            ("kickbase_api_cache_hits_total", "cache_hits"),
+            ("kickbase_api_cache_misses_total", "cache_misses"),
+        ):
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(
+                f'{metric}{{endpoint="{template}"}} {endpoint[key]}'
+                for template, endpoint in endpoints.items()
+            )
+        lines.append("# TYPE kickbase_api_request_seconds histogram")
+        for template, endpoint in endpoints.items():
+            count = 0
+            for bound, bucket in endpoint["buckets"].items():
+                count += bucket  # Prometheus buckets are cumulative
+                lines.append(
+                    f'kickbase_api_request_seconds_bucket{{endpoint="{template}",le="{bound}"}} {count}'
+                )
+            lines.append(
+                f'kickbase_api_request_seconds_sum{{endpoint="{template}"}} {endpoint["seconds"]}'
+            )
+            lines.append(
+                f'kickbase_api_request_seconds_count{{endpoint="{template}"}} {count}'
+            )
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,126 @@
+# Typed records of the API responses, decoded straight from the response bytes by msgspec (see call_api.decode).
+# Only the fields the code reads are declared, the decoder skips the rest of a payload without building dicts for it.
+# The attributes have readable names, `rename` maps them to the short keys of the API.
+from typing import Optional, Union
+import msgspec
+
+Id = Union[str, int]  # Most IDs are strings, some endpoints send numbers
+Number = Union[int, float]  # Kept as sent, like the json module does
+
+
+class Manager(msgspec.Struct, rename={"id": "i", "name": "n"}):
+    id: Id
+    name: str = ""
+
+
+class LeagueOverview(msgspec.Struct, rename={"managers": "us"}):
+    managers: list[Manager] = []
+
+
+class ManagerStats(
+    msgspec.Struct,
+    rename={
+        "matchday_wins": "mdw",
+        "placement": "pl",
+        "total_points": "tp",
+        "team_value": "tv",
+    },
+):
+    """Dashboard of a manager in the league."""
+
+    matchday_wins: Number = 0
+    placement: Number = 0
+    total_points: Number = 0
+    team_value: Number = 0
+
+
+class SquadPlayer(
+    msgspec.Struct,
+    rename={
+        "player_id": "pi",
+        "name": "pn",
+        "position": "pos",
+        "market_value": "mv",
+    },
+):
+    player_id: Id
+    name: str = ""
+    position: Optional[int] = None  # 1 goalkeeper, 2 defender, 3 midfielder, 4 forward
+    market_value: Number = 0
+
+
+class Squad(msgspec.Struct, rename={"players": "it"}):
+    players: list[SquadPlayer] = []
+
+
+class RankingEntry(
+    msgspec.Struct,
+    rename={
+        "user_id": "i",
+        "team_value": "tv",
+        "points": "sp",
+        "matchday_points": "mdp",
+    },
+):
+    user_id: Id
+    team_value: Number = 0
+    points: Number = 0  # Of the season
+    matchday_points: Number = 0
+
+
+class Ranking(msgspec.Struct, rename={"users": "us"}):
+    users: list[RankingEntry] = []
+
+
+class ActivityData(
+    msgspec.Struct,
+    omit_defaults=True,  # Saved activities only hold the keys the API sent
+    rename={
+        "player_id": "pi",
+        "price": "trp",
+        "team_id": "tid",
+        "seller": "slr",
+        "buyer": "byr",
+    },
+):
+    player_id: Optional[Id] = None
+    price: Number = 0
+    team_id: Optional[Id] = None
+    seller: Optional[str] = None  # Missing if the player was bought from Kickbase
+    buyer: Optional[str] = None  # Missing if the player was sold to Kickbase
+
+
+class Activity(msgspec.Struct, rename={"id": "i", "type": "t", "date": "dt"}):
+    """Entry of the activities feed, type 15 is a transfer."""
+
+    id: Id
+    type: int = 0
+    date: str = ""
+    data: Optional[ActivityData] = None
+
+
+class ActivityFeed(msgspec.Struct, rename={"activities": "af"}):
+    activities: list[Activity] = []
+
+
+class MarketValuePoint(msgspec.Struct, rename={"day": "dt", "value": "mv"}):
+    day: int  # Day number since 1970-01-01
+    value: Number = 0
+
+
+class MarketValues(msgspec.Struct, rename={"points": "it"}):
+    points: list[MarketValuePoint] = []
+
+
+class MatchPerformance(msgspec.Struct, rename={"points": "p", "minutes": "mp"}):
+    points: Optional[Number] = None
+    minutes: Optional[str] = None  # Like "67'"
+
+
+class SeasonPerformance(msgspec.Struct, rename={"title": "ti", "matches": "ph"}):
+    title: Optional[str] = None  # Like "2024/2025"
+    matches: list[MatchPerformance] = []
+
+
+class Performance(msgspec.Struct, rename={"seasons": "it"}):
+    seasons: list[SeasonPerformance] = []
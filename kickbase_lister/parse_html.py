@@ -0,0 +1,100 @@
+from html import escape
+
+# CSS styles for the table: black background, white font,
+# table borders, zebra-striping, and centered text for specific columns.
+STYLE = """
+        body {
+            background-color: #121212; /* A very dark grey is often easier on the eyes than pure black */
+            color: #FFFFFF;
+            font-family: Arial, sans-serif;
+        }
+        table {
+            width: 100%;
+            border-collapse: collapse; /* Removes space between cell borders */
+            margin: 20px 0;
+        }
+        th, td {
+            border: 1px solid #444444; /* Darker border for the theme */
+            padding: 12px;
+            text-align: left;
+        }
+        th {
+            background-color: #333333; /* Header background */
+        }
+        /* Zebra-striping for data rows */
+        tbody tr:nth-child(even) {
+            background-color: #222222;
+        }
+        tbody tr:hover {
+            background-color: #444444; /* Highlight row on hover */
+        }
+        /* Center the text in these specific columns */
+        .center-text {
+            text-align: center;
+        }
+"""
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<style>{style}</style>
+</head>
+<body>
+<table>
+<thead>
+<tr>{header}</tr>
+</thead>
+<tbody>
+{rows}
+</tbody>
+</table>
+</body>
+</html>
+"""
+
+# The name and the profile picture of the manager are centered next to each other in the first column
+NAME_CELL = (
+    '<td><div style="display: flex; align-items: center; justify-content: center; gap: 10px;">'
+    '<span>{name}</span><img src="https://cdn.kickbase.com/files/users/{user_id}/0" alt="" border=3 height=100 width=100>'
+    "</div></td>"
+)
+CENTERED_COLUMNS = range(2, 6)  # Columns 3 to 6
+
+
+def cell(tag: str, column: int, value) -> str:
+    css_class = ' class="center-text"' if column in CENTERED_COLUMNS else ""
+    return f"<{tag}{css_class}>{escape(str(value))}</{tag}>"
+
+
+def render_table(users: list) -> str:
+    """Render the styled HTML table of the users in one pass.
+
+    Args:
+        users (list): UserTable objects, one row is created from every user's return_data().
+
+    Returns:
+        str: The complete HTML page.
+    """
+    header = ""
+    rows = []
+    for user in users:
+        data = user.return_data()
+        if not header:
+            header = "".join(cell("th", column, key) for column, key in enumerate(data))
+        row = [NAME_CELL.format(name=escape(str(data["Name"])), user_id=user.user_id)]
+        row += [
+            cell("td", column, value)
+            for column, value in enumerate(data.values())
+            if column > 0
+        ]
+        rows.append(f"<tr>{''.join(row)}</tr>")
+    return PAGE.format(style=STYLE, header=header, rows="\n".join(rows))
+
+
+def style_table(users: list, filename: str = "styled_table.html") -> str:
+    """Write the styled HTML table of the users to the file and return its name."""
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(render_table(users))
+    print(f"Successfully created '{filename}' with the new styles!")
+    return filename
@@ -0,0 +1,142 @@
+"""This file will get the point data for every player to analyze it.
+    1. Get all player ids for every team of the competition table.
+    2. Get the player data for every player, saved in chunks so an interrupted crawl resumes.
+    3. Analyze. """
+
+from typing import Optional
+from .analytics import PerformanceData, season_year
+from .auth import login
+from .call_api import KickbaseClient, call_api
+from .fetch import FetchEngine
+from .metrics import log_event
+from .models import Performance
+from .store import Store
+import json
+import os
+import logging
+import time
+CHECKPOINT_SIZE = 50 # Players saved at once
+
+def get_team_ids(client: KickbaseClient) -> list[str]:
+    """Get the ids of all teams in the competition table."""
+    table = call_api(client, "/v4/competitions/1/table")
+    return [team["tid"] for team in table.get("it", [])]
+
+def get_player_ids(engine: FetchEngine, store: Store, refresh: bool = True) -> list[dict]:
+    """Get all player ids for every team. Unless refresh is set, saved teams are not fetched again.
+    """
+    if not refresh and (all_teams := store.teams()):
+        logging.info("Teams data already exists. Loading from database.")
+        return all_teams
+    if not refresh and os.path.exists("teams.json"):
+        logging.info("Importing teams data from teams.json.")
+        with open("teams.json", "r") as f:
+            all_teams = json.load(f)
+        store.save_teams(all_teams)
+        return all_teams
+    
+    logging.info("Fetching teams data from API.")
+    url = "/v4/competitions/1/teams/{team_id}/teamprofile"
+    team_ids = get_team_ids(engine.client)
+    responses = engine.map(
+        [url.format(team_id=team_id) for team_id in team_ids], return_exceptions=True
+    )
+    all_teams = []
+    for team_id, team_data in zip(team_ids, responses):
+        if isinstance(team_data, Exception):
+            logging.info(f"Error fetching data for team {team_id}: {team_data}")
+            continue
+        if team_data.get("it"):
+            all_teams.append(
+                {
+                    "team_id": team_data["tid"],
+                    "team_name": team_data["tn"],
+                    "players": team_data["it"]
+                }
+            )
+    store.save_teams(all_teams)
+    logging.info(f"Found {len(all_teams)} teams with players.")
+    return all_teams
+
+def get_player_data(engine: FetchEngine, player_ids: list[int]) -> list[list[tuple] | None]:
+    """Get the player data for the given players, fetched concurrently. None for failed players."""
+    urls = [
+        f"/v4/competitions/1/players/{player_id}/performance" for player_id in player_ids
+    ]
+    responses = engine.map(urls, return_exceptions=True, model=Performance)
+    return [
+        parse_performance(player_id, performance_data)
+        for player_id, performance_data in zip(player_ids, responses)
+    ]
+
+def parse_performance(player_id: int, performance_data: Performance) -> list[tuple] | None:
+    """Get the points, minutes and season of every match from the performance data of a player."""
+    points_per_minute = []
+    if isinstance(performance_data, Exception):
+        logging.error(f"Error fetching data for player {player_id}: {performance_data}")
+        return None
+    if performance_data.seasons:
+        for league in performance_data.seasons: # Iterate through all years
+            season = season_year(league.title)
+            for match in league.matches:
+                if match.points and match.minutes:
+                    points_per_minute.append((float(match.points),float(match.minutes.replace("'", "")),season))
+    else:
+        logging.warning(f"No performance data found for player {player_id}.")
+    return points_per_minute
+
+def analyze_players(client: Optional[KickbaseClient] = None, store: Optional[Store] = None):
+    """Analyze the players and get the points per minute.
+
+    Every chunk of players is saved as a checkpoint, an interrupted crawl continues with the missing players.
+    """
+    if client is None:
+        client = KickbaseClient()
+        login(client)
+    store = store or Store()
+    engine = FetchEngine(client, concurrency=8, rate=10.0)
+    crawl_id, resumed = store.start_crawl()
+    all_teams = get_player_ids(engine, store, refresh=not resumed)
+    players = {
+        str(player["i"]): (player, team["team_name"])
+        for team in all_teams
+        for player in team["players"]
+    }
+    done = store.crawled_players(crawl_id)
+    pending = [player_id for player_id in players if player_id not in done]
+    if resumed:
+        logging.info(f"Resuming crawl {crawl_id}, {len(done)} of {len(players)} players already done")
+
+    start = time.perf_counter()
+    retries_before = engine.client.retry.retries
+    crawled = errors = 0
+    for chunk_start in range(0, len(pending), CHECKPOINT_SIZE):
+        chunk = pending[chunk_start:chunk_start + CHECKPOINT_SIZE]
+        player_points = {}
+        for player_id, points_per_minute in zip(chunk, get_player_data(engine, chunk)):
+            if points_per_minute is None:
+                errors += 1 # Not saved, so the next crawl tries again
+                continue
+            player, team_name = players[player_id]
+            player_points[player_id] = {
+                "name": player["n"],
+                "status": player["st"],
+                "points_and_minutes": points_per_minute,
+                "market_value": player["mv"],
+                "position": player["pos"],
+                "team": team_name
+            }
+            log_event("player_crawled", player=player_id, team=team_name, matches=len(points_per_minute))
+        store.save_player_performance(player_points, crawl_id)
+        crawled += len(player_points)
+        elapsed = time.perf_counter() - start
+        logging.info(f"{len(done) + crawled}/{len(players)} players, {crawled / elapsed:.1f} players/s")
+
+    elapsed = time.perf_counter() - start
+    requests = len(pending) + engine.client.retry.retries - retries_before
+    store.finish_crawl(crawl_id, len(done) + crawled, errors, requests, elapsed)
+    PerformanceData.from_store(store).save() # Columnar copy for the analysis
+    logging.info(
+        f"Player analysis completed and saved to the database: {crawled} players in {elapsed:.1f}s "
+        f"({crawled / elapsed if elapsed else 0:.1f} players/s, {requests} requests, {errors} errors)."
+    )
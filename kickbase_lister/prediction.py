@@ -0,0 +1,179 @@
+# Expected points per match day for every player, fitted in one batch from the performance data.
+# Points per minute of a player are shrunk toward the mean of their position scaled by the strength
+# of their team, so players with few minutes get sensible predictions too.
+from typing import Optional, Sequence
+import numpy as np
+from .analytics import PerformanceData
+from .models import SquadPlayer
+
+GOALKEEPER, DEFENDER, MIDFIELDER, FORWARD = 1, 2, 3, 4
+# Lineups Kickbase allows as (defenders, midfielders, forwards), always behind one goalkeeper.
+# Only the lineup scores points.
+FORMATIONS = (
+    (3, 4, 3),
+    (3, 5, 2),
+    (3, 6, 1),
+    (4, 2, 4),
+    (4, 3, 3),
+    (4, 4, 2),
+    (4, 5, 1),
+    (5, 3, 2),
+    (5, 4, 1),
+)
+
+
+class ExpectedPointsModel:
+    def __init__(
+        self,
+        performance: PerformanceData,
+        prior_minutes: float = 450.0,
+        prior_matches: float = 3.0,
+        season_decay: float = 0.5,
+    ):
+        """Fit the expected points of all players of the performance data.
+
+        Args:
+            performance (PerformanceData): Matches the players appeared in.
+            prior_minutes (float): Weight of the team/position PPM in minutes played.
+            prior_matches (float): Weight of the position's minutes per appearance in matches.
+            season_decay (float): Weight of a season relative to the one after it.
+        """
+        self.performance = performance
+        self.prior_minutes = prior_minutes
+        self.prior_matches = prior_matches
+        self.season_decay = season_decay
+        self.fit()
+
+    @classmethod
+    def from_store(cls, store, **kwargs) -> "ExpectedPointsModel":
+        return cls(PerformanceData.open(store), **kwargs)
+
+    def fit(self) -> None:
+        data = self.performance
+        n_players = len(data.player_ids)
+        n_teams = len(data.team_names)
+        ### Older seasons count less, matches of unknown seasons count fully
+        latest = data.season.max(initial=0)
+        weight = np.where(
+            data.season > 0, self.season_decay ** (latest - data.season), 1.0
+        )
+        points = data.points * weight
+        minutes = data.minutes * weight
+
+        player_points = np.bincount(data.player, points, n_players)
+        player_minutes = np.bincount(data.player, minutes, n_players)
+        player_matches = np.bincount(data.player, weight, n_players)
+        overall_ppm = _ratio(points.sum(), minutes.sum())
+
+        team_ppm = _ratio(
+            np.bincount(data.team, points, n_teams),
+            np.bincount(data.team, minutes, n_teams),
+            overall_ppm,
+        )
+        ### Positions are small integers, so they index the arrays directly
+        n_positions = int(data.player_position.max(initial=0)) + 1
+        position = data.player_position.astype(np.int64)
+        position_points = np.bincount(position, player_points, n_positions)
+        position_minutes = np.bincount(position, player_minutes, n_positions)
+        position_matches = np.bincount(position, player_matches, n_positions)
+        self.position_ppm = _ratio(position_points, position_minutes, overall_ppm)
+        self.position_minutes = _ratio(
+            position_minutes,
+            position_matches,
+            _ratio(minutes.sum(), weight.sum()),
+        )
+
+        ### Team strength relative to the whole league scales the position mean
+        prior_ppm = self.position_ppm[position] * _ratio(
+            team_ppm[data.player_team], overall_ppm, 1.0
+        )
+        ppm = (player_points + self.prior_minutes * prior_ppm) / (
+            player_minutes + self.prior_minutes
+        )
+        minutes_per_match = (
+            player_minutes + self.prior_matches * self.position_minutes[position]
+        ) / (player_matches + self.prior_matches)
+        self.expected = ppm * minutes_per_match
+        self.position_expected = self.position_ppm * self.position_minutes
+
+    def predict(
+        self, player_ids: Sequence, positions: Optional[Sequence[int]] = None
+    ) -> np.ndarray:
+        """Expected points per match day of the players.
+
+        Args:
+            player_ids (list): IDs of the players.
+            positions (list): Positions of the players (1 goalkeeper to 4 forward, 0 if unknown), used
+                for players without performance data.
+
+        Returns:
+            np.ndarray: Expected points of every player, 0 for unknown players without a known position.
+        """
+        index = np.array(
+            [self.performance.player_index(player_id) for player_id in player_ids],
+            dtype=float,
+        )
+        known = ~np.isnan(index)
+        result = np.zeros(len(index))
+        result[known] = self.expected[index[known].astype(np.int64)]
+        if positions is not None:
+            position = np.asarray(positions, dtype=np.int64)
+            ### Position 0 holds the players of unknown position, it is no fallback
+            fallback = (
+                ~known & (position > 0) & (position < len(self.position_expected))
+            )
+            result[fallback] = self.position_expected[position[fallback]]
+        return result
+
+    def squad_points(self, squad: list[SquadPlayer]) -> float:
+        """Expected points of the best lineup of the squad over all allowed formations.
+
+        Positions missing in the squad are taken from the performance data, players without any
+        known position can't be lined up. Positions the squad can't fill stay empty.
+
+        Args:
+            squad (list): Players of the squad endpoint.
+        """
+        player_ids = [player.player_id for player in squad]
+        positions = np.array([player.position or 0 for player in squad], dtype=np.int64)
+        for i, player_id in enumerate(player_ids):
+            index = self.performance.player_index(player_id)
+            if not positions[i] and index is not None:
+                positions[i] = self.performance.player_position[index]
+        expected = self.predict(player_ids, positions)
+        ### Sums of the best n players of every position, n = 0 ... all players of the position
+        best = {
+            position: np.concatenate(
+                ([0.0], np.cumsum(np.sort(expected[positions == position])[::-1]))
+            )
+            for position in (GOALKEEPER, DEFENDER, MIDFIELDER, FORWARD)
+        }
+
+        def top(position: int, count: int) -> float:
+            return best[position][min(count, len(best[position]) - 1)]
+
+        return float(
+            top(GOALKEEPER, 1)
+            + max(
+                top(DEFENDER, defenders)
+                + top(MIDFIELDER, midfielders)
+                + top(FORWARD, forwards)
+                for defenders, midfielders, forwards in FORMATIONS
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.performance.player_ids)
+
+
+def _ratio(numerator, denominator, default: float = 0.0):
+    """numerator / denominator, default where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    result = np.divide(
+        numerator,
+        denominator,
+        out=np.broadcast_to(np.asarray(default, dtype=float), numerator.shape).copy(),
+        where=denominator != 0,
+    )
+    return result if result.ndim else float(result)
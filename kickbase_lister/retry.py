@@ -0,0 +1,215 @@
+# Retry handling of the API client: jittered exponential backoff honouring Retry-After,
+# per-endpoint retry budgets and a per-host circuit breaker.
+# Throttling slows the run down instead of aborting it, a dead host makes it fail fast.
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+import requests
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Counted by the circuit breaker, 429 only means slow down
+FAILURE_STATUS = {500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the circuit of its host is open."""
+
+
+class RetryBudget:
+    """Limits retries of one endpoint to a share of its requests so a broken endpoint can't multiply the load.
+
+    Every request deposits `ratio` retries, every retry withdraws one, `minimum` retries are always allowed.
+    Retries the server asked for with Retry-After are not taken from the budget.
+    """
+
+    def __init__(self, ratio: float = 0.2, minimum: float = 10):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.balance = minimum
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.balance = min(self.balance + self.ratio, self.minimum * 10)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+class CircuitBreaker:
+    """Opens after `threshold` failures in a row and lets one trial request through after `cooldown` seconds."""
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.trial_running or self.clock() - self.opened_at < self.cooldown:
+                return False
+            self.trial_running = True  # Half open
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.threshold:
+                self.opened_at = self.clock()
+            self.trial_running = False
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        budget_ratio: float = 0.2,
+        budget_minimum: float = 10,
+        breaker_threshold: int = 10,
+        breaker_cooldown: float = 30.0,
+    ):
+        """Decides whether and when a failed request is sent again.
+
+        Args:
+            max_retries (int): Maximum number of retries of one request.
+            base_delay (float): Backoff before the first retry, doubled for every following one.
+            max_delay (float): Upper bound of a single backoff, also caps Retry-After.
+            budget_ratio (float): Retries allowed per request of an endpoint, see RetryBudget.
+            budget_minimum (float): Retries of an endpoint that are always allowed.
+            breaker_threshold (int): Failures in a row after which the circuit of a host opens.
+            breaker_cooldown (float): Seconds until an open circuit lets a trial request through.
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_minimum = budget_minimum
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.retries = 0
+        ### Replays swap these for the scaled waits and the clock of the cassette
+        self.sleep: Callable[[float], None] = time.sleep
+        self.clock: Callable[[], float] = time.monotonic
+        self._budgets: dict[str, RetryBudget] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def budget(self, url: str) -> RetryBudget:
+        """Return the retry budget of the endpoint, IDs in the path share one budget."""
+        endpoint = re.sub(r"\d+", "N", urlsplit(url).path)
+        with self._lock:
+            if endpoint not in self._budgets:
+                self._budgets[endpoint] = RetryBudget(
+                    self.budget_ratio, self.budget_minimum
+                )
+            return self._budgets[endpoint]
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(
+                    self.breaker_threshold,
+                    self.breaker_cooldown,
+                    lambda: self.clock(),
+                )
+            return self._breakers[host]
+
+    def backoff(
+        self, attempt: int, response: Optional[requests.Response] = None
+    ) -> float:
+        """Seconds to wait before the given retry, the server's Retry-After wins over the own backoff."""
+        retry_after = parse_retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay) + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def send(self, send, url: str) -> requests.Response:
+        """Call send() until it returns a response that needs no retry.
+
+        Args:
+            send (callable): Sends the request and returns the response.
+            url (str): Full URL of the request, selects the circuit breaker and retry budget.
+
+        Raises:
+            CircuitOpenError: If the circuit of the host is open.
+            requests.exceptions.RequestException: If the last attempt failed without a response.
+
+        Returns:
+            requests.Response: The last response, its status may still be an error.
+        """
+        breaker = self.breaker(url)
+        budget = self.budget(url)
+        budget.deposit()
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {urlsplit(url).netloc}")
+            response = None
+            try:
+                response = send()
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                breaker.record_failure()
+                error = e
+            else:
+                if response.status_code in FAILURE_STATUS:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if response.status_code not in RETRY_STATUS:
+                    return response
+            ### A 429 with Retry-After paces the client instead of failing, so it costs no budget
+            paced = response is not None and parse_retry_after(response) is not None
+            if attempt >= self.max_retries or not (paced or budget.withdraw()):
+                if response is None:
+                    raise error
+                return response
+            self.sleep(self.backoff(attempt, response))
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+
+
+def parse_retry_after(response: requests.Response) -> Optional[float]:
+    """Return the Retry-After header of the response in seconds, None if it is missing or invalid."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,200 @@
+"""Resident service keeping the session, caches and state alive between refreshes.
+
+Polls the activities feed, the current match day and its ranking of every league on a schedule,
+re-renders a league's table only when something changed and serves the latest tables over HTTP:
+    /                   Links to the tables of all leagues
+    /leagues/<id>       Styled table of the league
+    /metrics            Stage timings and API metrics in the Prometheus text format (with --metrics)
+"""
+
+import logging
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from html import escape
+from typing import Optional
+from .auth import login
+from .cache import NO_CACHE, ResponseCache
+from .columnar import MarketValueHistory
+from .call_api import KickbaseClient
+from .fetch import FetchEngine
+from .market_value import MarketValueStore
+from .metrics import RUN_REPORT_FILE
+from .store import Store
+from .user_list import (
+    FETCH_CONCURRENCY,
+    FETCH_RATE,
+    get_match_days,
+    get_newest_activity,
+    get_ranking,
+    load_expected_points_model,
+    migrate_json_files,
+    report_league,
+    select_leagues,
+)
+
+
+class ReportService:
+    def __init__(self, league_names: Optional[list[str]] = None, interval: float = 300):
+        """Keeps everything needed for a refresh in memory.
+
+        Args:
+            league_names (list): Names of the leagues, all leagues of the user if not given.
+            interval (float): Seconds between two polls.
+        """
+        self.interval = interval
+        self.client = KickbaseClient(cache=ResponseCache())
+        self.user = login(self.client)
+        self.store = Store()
+        self.engine = FetchEngine(
+            self.client,
+            concurrency=FETCH_CONCURRENCY,
+            rate=FETCH_RATE,
+        )
+        self.mv_store = MarketValueStore(
+            self.engine, self.store, MarketValueHistory.load()
+        )
+        self.mv_store_date = date.today()
+        self.model = load_expected_points_model(self.store)
+        self.leagues = select_leagues(self.user.leagues, league_names)
+        if len(self.leagues) == 1:
+            migrate_json_files(
+                self.store, self.leagues[0]["id"], self.leagues[0]["creation"]
+            )
+        self.reports: dict[str, str] = {}  # League ID -> HTML of the styled table
+        self._seen: dict[str, tuple] = {}  # League ID -> state of the last poll
+        self._stop = threading.Event()
+
+    def poll(self, league_id: str, current_match_day: int) -> tuple:
+        """Cheap signal of everything the table of the league shows.
+
+        The newest activity covers the transfers, the ranking of the current match day the points
+        and team values, which change without any activity. The ranking is fetched past the cache
+        but stored in it, so a re-render uses the same one.
+        """
+        ranking = get_ranking(self.client, league_id, current_match_day, refresh=True)
+        return (
+            get_newest_activity(self.client, league_id),
+            current_match_day,
+            tuple(
+                (entry.user_id, entry.team_value, entry.points, entry.matchday_points)
+                for entry in ranking.users
+            ),
+        )
+
+    def refresh(self) -> list[str]:
+        """Re-render the tables of all leagues whose feed, match day or ranking changed.
+
+        Returns:
+            list: IDs of the re-rendered leagues.
+        """
+        ### Market values change once a day, so the series are only kept for the day.
+        ### The expected points are refitted with them to pick up new performance data.
+        if date.today() != self.mv_store_date:
+            self.mv_store = MarketValueStore(
+                self.engine, self.store, self.mv_store.history
+            )
+            self.mv_store_date = date.today()
+            self.model = load_expected_points_model(self.store)
+        stage = self.client.metrics.stage
+        with stage("match days"):
+            match_days = get_match_days(self.client, ttl=NO_CACHE)
+        refreshed = []
+        for league in self.leagues:
+            state = self.poll(league["id"], match_days[0])
+            if self._seen.get(league["id"]) == state:
+                continue
+            ### The cached dashboards and squads are older than the change
+            self.client.cache.invalidate(f"/v4/leagues/{league['id']}/managers/")
+            self.client.cache.invalidate(f"/v4/leagues/{league['id']}/overview")
+            filename = report_league(
+                self.client,
+                self.engine,
+                self.store,
+                self.mv_store,
+                league,
+                match_days,
+                model=self.model,
+            )
+            with open(filename, "r", encoding="utf-8") as f:
+                self.reports[league["id"]] = f.read()
+            self._seen[league["id"]] = state
+            refreshed.append(league["id"])
+        self.mv_store.save_history()
+        self.client.metrics.save_report(RUN_REPORT_FILE)
+        logging.info(
+            f"Refreshed {len(refreshed)} of {len(self.leagues)} leagues, API cache: {self.client.cache.stats()}"
+        )
+        return refreshed
+
+    def run(self) -> None:
+        """Refresh every interval until stop() is called, errors are logged and retried next time."""
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                logging.exception("Refresh failed")
+            self._stop.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def index(self) -> str:
+        links = "".join(
+            f'<li><a href="/leagues/{escape(str(league["id"]))}">{escape(league["name"])}</a></li>'
+            for league in self.leagues
+            if league["id"] in self.reports
+        )
+        return f'<!DOCTYPE html><html><head><meta charset="utf-8"></head><body><ul>{links}</ul></body></html>'
+
+
+def make_handler(service: ReportService, metrics: bool = False) -> type:
+    class ReportHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            content_type = "text/html; charset=utf-8"
+            if self.path == "/":
+                body = service.index()
+            elif self.path == "/metrics" and metrics:
+                body = service.client.metrics.prometheus()
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path.startswith("/leagues/"):
+                body = service.reports.get(
+                    self.path.removeprefix("/leagues/").strip("/")
+                )
+            else:
+                body = None
+            if body is None:
+                self.send_error(404)
+                return
+            content = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            logging.debug(format, *args)
+
+    return ReportHandler
+
+
+def serve(
+    league_names: Optional[list[str]] = None,
+    interval: float = 300,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    metrics: bool = False,
+) -> None:
+    service = ReportService(league_names, interval)
+    server = ThreadingHTTPServer((host, port), make_handler(service, metrics))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.info(f"Serving the tables on http://{host}:{server.server_port}/")
+    try:
+        service.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.shutdown()
+
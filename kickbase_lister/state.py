@@ -0,0 +1,31 @@
+# Local files holding the state of the runs: response cache, database, columnar history and login.
+# Every API server other than Kickbase's own (e.g. the benchmark stub) gets its own files, so its
+# data never mixes with the real one when both are used from the same working directory.
+import os
+import re
+from typing import Optional
+from urllib.parse import urlsplit
+
+API_URL = "https://api.kickbase.com"
+
+
+def api_url() -> str:
+    """Base URL of the API, KICKBASE_API_URL points the client to another server."""
+    return (os.getenv("KICKBASE_API_URL") or API_URL).rstrip("/")
+
+
+def state_path(filename: str, base_url: Optional[str] = None) -> str:
+    """Path of a local state file of the API server, the file itself for Kickbase's API.
+
+    Other servers get the host inserted before the extension, e.g. kickbase.127.0.0.1_8080.sqlite.
+
+    Args:
+        filename (str): File or directory of the state.
+        base_url (str): Base URL of the server, the configured one if not given.
+    """
+    base_url = (base_url or api_url()).rstrip("/")
+    if base_url == API_URL:
+        return filename
+    host = re.sub(r"[^\w.-]+", "_", urlsplit(base_url).netloc or base_url)
+    root, extension = os.path.splitext(filename)
+    return f"{root}.{host}{extension}"
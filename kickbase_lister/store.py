@@ -0,0 +1,448 @@
+# Local SQLite database holding the state of all runs: transfers, turnovers, team values,
+# market values and player performance. Writes are transactional upserts of the changed rows only.
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+import msgspec
+
+from .models import Activity
+from .state import state_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activities (
+    league_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    player_id TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (league_id, id)
+);
+CREATE INDEX IF NOT EXISTS activities_date ON activities (league_id, date);
+CREATE INDEX IF NOT EXISTS activities_player ON activities (player_id);
+
+CREATE TABLE IF NOT EXISTS transfers (
+    league_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    player_id TEXT NOT NULL,
+    manager TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (league_id, date)
+);
+CREATE INDEX IF NOT EXISTS transfers_player ON transfers (player_id);
+CREATE INDEX IF NOT EXISTS transfers_manager ON transfers (league_id, manager);
+
+CREATE TABLE IF NOT EXISTS open_positions (
+    league_id TEXT NOT NULL,
+    player_id TEXT NOT NULL,
+    buys TEXT NOT NULL,
+    PRIMARY KEY (league_id, player_id)
+);
+
+CREATE TABLE IF NOT EXISTS turnovers (
+    league_id TEXT NOT NULL,
+    buy_date TEXT NOT NULL,
+    sell_date TEXT NOT NULL,
+    player_id TEXT NOT NULL,
+    manager TEXT,
+    buy TEXT NOT NULL,
+    sell TEXT NOT NULL,
+    PRIMARY KEY (league_id, buy_date, sell_date)
+);
+CREATE INDEX IF NOT EXISTS turnovers_player ON turnovers (player_id);
+CREATE INDEX IF NOT EXISTS turnovers_manager ON turnovers (league_id, manager);
+
+CREATE TABLE IF NOT EXISTS manager_stats (
+    league_id TEXT NOT NULL,
+    manager TEXT NOT NULL,
+    stat TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    player TEXT,
+    PRIMARY KEY (league_id, manager, stat)
+);
+
+CREATE TABLE IF NOT EXISTS team_values (
+    league_id TEXT NOT NULL,
+    manager_id TEXT NOT NULL,
+    manager TEXT NOT NULL,
+    match_day INTEGER NOT NULL,
+    team_value INTEGER NOT NULL,
+    PRIMARY KEY (league_id, manager_id, match_day)
+);
+CREATE INDEX IF NOT EXISTS team_values_manager ON team_values (league_id, manager);
+
+CREATE TABLE IF NOT EXISTS market_values (
+    player_id TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    market_value INTEGER NOT NULL,
+    PRIMARY KEY (player_id, day)
+);
+CREATE INDEX IF NOT EXISTS market_values_day ON market_values (day);
+
+CREATE TABLE IF NOT EXISTS players (
+    player_id TEXT PRIMARY KEY,
+    first_name TEXT,
+    last_name TEXT,
+    team_id TEXT,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS teams (
+    team_id TEXT PRIMARY KEY,
+    team_name TEXT NOT NULL,
+    players TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS player_performance (
+    player_id TEXT PRIMARY KEY,
+    name TEXT,
+    status INTEGER,
+    market_value INTEGER,
+    position INTEGER,
+    team TEXT,
+    points_and_minutes TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS player_performance_team ON player_performance (team);
+
+CREATE TABLE IF NOT EXISTS crawls (
+    crawl_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    players INTEGER,
+    errors INTEGER,
+    requests INTEGER,
+    seconds REAL
+);
+
+CREATE TABLE IF NOT EXISTS crawl_progress (
+    crawl_id INTEGER NOT NULL,
+    player_id TEXT NOT NULL,
+    PRIMARY KEY (crawl_id, player_id)
+);
+"""
+
+
+class Store:
+    def __init__(self, filename: Optional[str] = None):
+        """Local database for the state of all runs.
+
+        Args:
+            filename (str): Path of the SQLite database, created if it doesn't exist. Defaults to
+                kickbase.sqlite, or a separate file for other API servers than Kickbase's.
+        """
+        self.filename = filename or state_path("kickbase.sqlite")
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(self.filename, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        """Run the statements of the block in one transaction, rolled back on errors."""
+        with self._lock, self._db:
+            yield self._db
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    ### Activities feed
+    def high_water_mark(self, league_id: str) -> Optional[dict]:
+        """ID and date of the newest saved activity of the league."""
+        rows = self._query(
+            "SELECT id, date FROM activities WHERE league_id = ? ORDER BY date DESC LIMIT 1",
+            (league_id,),
+        )
+        return {"id": rows[0][0], "date": rows[0][1]} if rows else None
+
+    def add_activities(self, league_id: str, activities: list[Activity]) -> int:
+        """Save new activities, already saved ones are ignored. Returns the number of new ones."""
+        with self.transaction() as db:
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO activities (league_id, id, date, player_id, data) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        league_id,
+                        activity.id,
+                        activity.date,
+                        str(activity.data.player_id),
+                        msgspec.json.encode(activity).decode(),
+                    )
+                    for activity in activities
+                ],
+            )
+            return db.total_changes - before
+
+    def unapplied_activities(self, league_id: str) -> list[Activity]:
+        """Activities sorted by date which have no processed transfer in the ledger yet."""
+        rows = self._query(
+            """SELECT a.data FROM activities a WHERE a.league_id = ? AND NOT EXISTS (
+                SELECT 1 FROM transfers t WHERE t.league_id = a.league_id AND t.date = a.date
+            ) ORDER BY a.date""",
+            (league_id,),
+        )
+        return [msgspec.json.decode(row[0], type=Activity) for row in rows]
+
+    ### Turnover ledger
+    def load_ledger_state(self, league_id: str) -> tuple[list[dict], list[tuple]]:
+        """Open positions and manager stats of the league, the only state the ledger needs.
+
+        Returns:
+            tuple: All open buys and rows of (manager, stat, value, player).
+        """
+        open_buys = [
+            buy
+            for (buys,) in self._query(
+                "SELECT buys FROM open_positions WHERE league_id = ?", (league_id,)
+            )
+            for buy in json.loads(buys)
+        ]
+        stats = self._query(
+            "SELECT manager, stat, value, player FROM manager_stats WHERE league_id = ?",
+            (league_id,),
+        )
+        return open_buys, stats
+
+    def save_ledger_changes(
+        self,
+        league_id: str,
+        transfers: list[dict],
+        turnovers: list[tuple[dict, dict]],
+        positions: dict[str, list[dict]],
+        stats: list[tuple],
+    ) -> None:
+        """Write the changes of one ledger run in a single transaction.
+
+        Args:
+            transfers (list): Newly processed transfers.
+            turnovers (list): Newly realized (buy, sell) turnovers.
+            positions (dict): Open buys of every player whose position changed, empty if closed.
+            stats (list): Changed rows of (manager, stat, value, player).
+        """
+        with self.transaction() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO transfers (league_id, date, player_id, manager, data) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        league_id,
+                        t["date"],
+                        str(t["playerId"]),
+                        t["user"],
+                        json.dumps(t),
+                    )
+                    for t in transfers
+                ],
+            )
+            db.executemany(
+                "INSERT OR REPLACE INTO turnovers (league_id, buy_date, sell_date, player_id, manager, buy, sell) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        league_id,
+                        buy["date"],
+                        sell["date"],
+                        str(sell["playerId"]),
+                        buy["user"],
+                        json.dumps(buy),
+                        json.dumps(sell),
+                    )
+                    for buy, sell in turnovers
+                ],
+            )
+            db.executemany(
+                "DELETE FROM open_positions WHERE league_id = ? AND player_id = ?",
+                [(league_id, str(pid)) for pid, buys in positions.items() if not buys],
+            )
+            db.executemany(
+                "INSERT OR REPLACE INTO open_positions (league_id, player_id, buys) VALUES (?, ?, ?)",
+                [
+                    (league_id, str(pid), json.dumps(buys))
+                    for pid, buys in positions.items()
+                    if buys
+                ],
+            )
+            db.executemany(
+                "INSERT OR REPLACE INTO manager_stats (league_id, manager, stat, value, player) VALUES (?, ?, ?, ?, ?)",
+                [(league_id, *row) for row in stats],
+            )
+
+    def has_ledger(self, league_id: str) -> bool:
+        return bool(
+            self._query(
+                "SELECT 1 FROM transfers WHERE league_id = ? LIMIT 1", (league_id,)
+            )
+        )
+
+    ### Team values
+    def save_team_values(self, league_id: str, rows: Iterable[tuple]) -> None:
+        """Upsert rows of (manager_id, manager, match_day, team_value), unchanged rows aren't written."""
+        with self.transaction() as db:
+            db.executemany(
+                """INSERT INTO team_values (league_id, manager_id, manager, match_day, team_value)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (league_id, manager_id, match_day) DO UPDATE SET
+                    manager = excluded.manager, team_value = excluded.team_value
+                WHERE team_value != excluded.team_value OR manager != excluded.manager""",
+                [(league_id, str(row[0]), *row[1:]) for row in rows],
+            )
+
+    ### Market values
+    def save_market_values(self, player_id, series: dict[int, int]) -> None:
+        """Upsert the market value series of a player, unchanged days aren't written."""
+        with self.transaction() as db:
+            db.executemany(
+                """INSERT INTO market_values (player_id, day, market_value) VALUES (?, ?, ?)
+                ON CONFLICT (player_id, day) DO UPDATE SET market_value = excluded.market_value
+                WHERE market_value != excluded.market_value""",
+                [(str(player_id), day, value) for day, value in series.items()],
+            )
+
+    def market_value_rows(self) -> list[tuple[int, int, int]]:
+        """(player ID, day, market value) of all saved market values, sorted by player and day."""
+        return self._query(
+            "SELECT CAST(player_id AS INTEGER), day, market_value FROM market_values ORDER BY 1, 2"
+        )
+
+    ### Player metadata
+    def players(self, player_ids: Iterable, max_age: Optional[float] = None) -> dict:
+        """Saved metadata of the given players in the format of the player endpoint (fn, ln, tid).
+
+        Args:
+            player_ids (Iterable): IDs of the players to look up, unknown ones are missing in the result.
+            max_age (float): Ignore metadata saved more than max_age seconds ago.
+        """
+        player_ids = [str(player_id) for player_id in player_ids]
+        min_updated = time.time() - max_age if max_age is not None else 0
+        players = {}
+        ### Stay below SQLite's limit of variables per statement
+        for start in range(0, len(player_ids), 500):
+            chunk = player_ids[start : start + 500]
+            rows = self._query(
+                f"SELECT player_id, first_name, last_name, team_id FROM players WHERE updated_at >= ? AND player_id IN ({', '.join('?' * len(chunk))})",
+                (min_updated, *chunk),
+            )
+            for player_id, first_name, last_name, team_id in rows:
+                players[player_id] = {"fn": first_name, "ln": last_name, "tid": team_id}
+        return players
+
+    def save_players(self, players: dict) -> None:
+        """Upsert the metadata of players given as player ID -> player endpoint response."""
+        now = time.time()
+        with self.transaction() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO players (player_id, first_name, last_name, team_id, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        str(player_id),
+                        player.get("fn"),
+                        player.get("ln"),
+                        player.get("tid"),
+                        now,
+                    )
+                    for player_id, player in players.items()
+                ],
+            )
+
+    ### Teams and player performance
+    def save_teams(self, teams: list[dict]) -> None:
+        with self.transaction() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO teams (team_id, team_name, players) VALUES (?, ?, ?)",
+                [
+                    (
+                        str(team["team_id"]),
+                        team["team_name"],
+                        json.dumps(team["players"]),
+                    )
+                    for team in teams
+                ],
+            )
+
+    def teams(self) -> list[dict]:
+        return [
+            {"team_id": team_id, "team_name": team_name, "players": json.loads(players)}
+            for team_id, team_name, players in self._query(
+                "SELECT team_id, team_name, players FROM teams ORDER BY CAST(team_id AS INTEGER)"
+            )
+        ]
+
+    def save_player_performance(
+        self, player_points: dict[str, dict], crawl_id: Optional[int] = None
+    ) -> None:
+        """Save the performance of the players, marking them as done in the crawl if given."""
+        with self.transaction() as db:
+            if crawl_id is not None:
+                db.executemany(
+                    "INSERT OR IGNORE INTO crawl_progress (crawl_id, player_id) VALUES (?, ?)",
+                    [(crawl_id, str(player_id)) for player_id in player_points],
+                )
+            db.executemany(
+                "INSERT OR REPLACE INTO player_performance (player_id, name, status, market_value, position, team, points_and_minutes) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        str(player_id),
+                        player["name"],
+                        player["status"],
+                        player["market_value"],
+                        player["position"],
+                        player["team"],
+                        json.dumps(player["points_and_minutes"]),
+                    )
+                    for player_id, player in player_points.items()
+                ],
+            )
+
+    def player_performance(self) -> dict[str, dict]:
+        """Performance of every player in the format of the old player_analysis.json."""
+        return {
+            player_id: {
+                "name": name,
+                "status": status,
+                "points_and_minutes": json.loads(points_and_minutes),
+                "market_value": market_value,
+                "position": position,
+                "team": team,
+            }
+            for player_id, name, status, market_value, position, team, points_and_minutes in self._query(
+                "SELECT player_id, name, status, market_value, position, team, points_and_minutes FROM player_performance"
+            )
+        }
+
+    ### Crawls of the player performance, resumed after interruptions
+    def start_crawl(self) -> tuple[int, bool]:
+        """Return the ID of the unfinished crawl and True, or of a new crawl and False."""
+        with self.transaction() as db:
+            row = db.execute(
+                "SELECT crawl_id FROM crawls WHERE finished_at IS NULL ORDER BY crawl_id DESC LIMIT 1"
+            ).fetchone()
+            if row:
+                return row[0], True
+            cursor = db.execute(
+                "INSERT INTO crawls (started_at) VALUES (?)", (time.time(),)
+            )
+            return cursor.lastrowid, False
+
+    def crawled_players(self, crawl_id: int) -> set[str]:
+        return {
+            player_id
+            for (player_id,) in self._query(
+                "SELECT player_id FROM crawl_progress WHERE crawl_id = ?", (crawl_id,)
+            )
+        }
+
+    def finish_crawl(
+        self, crawl_id: int, players: int, errors: int, requests: int, seconds: float
+    ) -> None:
+        """Record the throughput of the crawl and drop its progress."""
+        with self.transaction() as db:
+            db.execute(
+                "UPDATE crawls SET finished_at = ?, players = ?, errors = ?, requests = ?, seconds = ? WHERE crawl_id = ?",
+                (time.time(), players, errors, requests, seconds, crawl_id),
+            )
+            db.execute("DELETE FROM crawl_progress WHERE crawl_id = ?", (crawl_id,))
+
+    def close(self) -> None:
+        self._db.close()
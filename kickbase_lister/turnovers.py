@@ -0,0 +1,119 @@
+# Pairs the buys and sells of the processed transfers into turnovers (buy, sell).
+import operator
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable
+
+
+def starter_buy(sell_transfer: dict, league_start: str) -> dict:
+    """Create the simulated buy transfer of a player that was assigned at the start of the season."""
+    date = datetime.strptime(
+        league_start, "%Y-%m-%dT%H:%M:%SZ"
+    ).isoformat()  # Format 2025-08-07T16:00:08Z
+    return {
+        "date": date,
+        "type": "assigned_at_start",
+        "user": sell_transfer["user"],
+        "tradePartner": "Kickbase",
+        "price": 0,
+        "playerId": sell_transfer["playerId"],
+        "teamId": sell_transfer["teamId"],
+        "firstName": sell_transfer["firstName"],
+        "lastName": sell_transfer["lastName"],
+    }
+
+
+class TurnoverLedger:
+    def __init__(
+        self,
+        league_start: str,
+        open_buys: Iterable[dict] = (),
+        stats: Iterable[tuple] = (),
+    ):
+        """State of all processed transfers, updated one new transfer at a time.
+
+        Holds the open positions (buys not sold yet) of every player and the biggest overpay, win
+        and loss of every manager, so a run only has to apply the transfers added since the last
+        one. The processed transfers and realized turnovers are only kept until they are saved.
+
+        Args:
+            league_start (str): Creation date of the league, used for players assigned at the start.
+            open_buys (Iterable): Saved buys that are not sold yet.
+            stats (Iterable): Saved rows of (manager, stat, value, player).
+        """
+        self.league_start = league_start
+        self.known_dates: set[str] = set()
+        self.open_positions: dict[int, list[dict]] = defaultdict(list)
+        for buy in open_buys:
+            self.open_positions[buy["playerId"]].append(buy)
+        self.managers: dict[str, dict[str, dict]] = defaultdict(dict)
+        for manager, stat, value, player in stats:
+            self.managers[manager][stat] = {"value": value, "player": player}
+        ### Changes since the ledger was loaded
+        self.transfers: list[dict] = []
+        self.turnovers: list[tuple[dict, dict]] = []
+        self.changed_positions: set[int] = set()
+        self.changed_stats: set[tuple[str, str]] = set()
+
+    def apply(self, transfer: dict) -> None:
+        """Apply a new processed transfer, transfers have to be applied sorted by date."""
+        self.transfers.append(transfer)
+        self.known_dates.add(transfer["date"])
+        ### Buys from Kickbase or another manager count as the buyer's overpay
+        buyer = {"buy": transfer["user"], "sell": transfer["tradePartner"]}.get(
+            transfer["type"]
+        )
+        if buyer:
+            overpay = transfer["price"] - transfer["marketPrice"]
+            self._keep(buyer, "overpay", overpay, transfer["lastName"], operator.gt)
+
+        ### Every transfer that isn't a sell opens a position, every transfer that isn't a buy closes them
+        if transfer["type"] != "sell":
+            self.open_positions[transfer["playerId"]].append(transfer)
+            self.changed_positions.add(transfer["playerId"])
+        if transfer["type"] != "buy":
+            buys = self.open_positions.pop(transfer["playerId"], [])
+            self.changed_positions.add(transfer["playerId"])
+            if not buys:  # Player was assigned at the start of the season
+                buys = [starter_buy(transfer, self.league_start)]
+            for buy in buys:
+                self._realize(buy, transfer)
+
+    def _realize(self, buy: dict, sell: dict) -> None:
+        self.turnovers.append((buy, sell))
+        if buy["tradePartner"] == "Kickbase" and buy["price"] == 0:
+            return
+        diff = sell["price"] - buy["price"]
+        self._keep(buy["user"], "win", diff, buy["lastName"], operator.gt)
+        self._keep(buy["user"], "loss", diff, buy["lastName"], operator.lt)
+
+    def _keep(self, manager: str, stat: str, value: int, player: str, better) -> None:
+        """Keep the first player with the best value of the stat for the manager."""
+        current = self.managers[manager].get(stat)
+        if current is None or better(value, current["value"]):
+            self.managers[manager][stat] = {"value": value, "player": player}
+            self.changed_stats.add((manager, stat))
+
+    def stats(self, manager: str) -> dict[str, dict]:
+        """Biggest overpay, win and loss of the manager, a stat is missing if the manager has none."""
+        return self.managers.get(manager, {})
+
+    def changes(self) -> dict:
+        """Everything changed since the ledger was loaded, in the format of Store.save_ledger_changes."""
+        return {
+            "transfers": self.transfers,
+            "turnovers": self.turnovers,
+            "positions": {
+                player_id: self.open_positions.get(player_id, [])
+                for player_id in self.changed_positions
+            },
+            "stats": [
+                (
+                    manager,
+                    stat,
+                    self.managers[manager][stat]["value"],
+                    self.managers[manager][stat]["player"],
+                )
+                for manager, stat in self.changed_stats
+            ],
+        }
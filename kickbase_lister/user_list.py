@@ -0,0 +1,816 @@
+from .auth import login
+from .call_api import ApiError, call_api, decode, fetch_json, KickbaseClient
+from .fetch import FetchEngine, iter_pages
+from .turnovers import TurnoverLedger
+from .store import Store
+from .market_value import (
+    MarketValueStore,
+    date_to_day_number,
+    yesterday_day_number,
+)
+from .cache import ResponseCache, NEVER_EXPIRE, NO_CACHE
+from .metrics import RUN_REPORT_FILE, log_event
+from .cassette import Cassette
+from .models import (
+    Activity,
+    ActivityData,
+    ActivityFeed,
+    LeagueOverview,
+    ManagerStats,
+    Ranking,
+    Squad,
+    SquadPlayer,
+)
+from requests import RequestException
+import logging
+import json
+import msgspec
+from os import path
+from typing import TYPE_CHECKING, Iterator, Optional
+from datetime import datetime
+from .parse_html import style_table
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+if TYPE_CHECKING:  # NumPy is only loaded by the stages that use it
+    from .prediction import ExpectedPointsModel
+
+PLAYER_METADATA_MAX_AGE = 30 * 24 * 60 * 60  # Names rarely change, refresh them monthly
+FETCH_CONCURRENCY = 8  # Requests in flight at once
+FETCH_RATE = 10.0  # Requests per second sent to the API
+_player_metadata_lock = threading.Lock()
+""" 1. Find every manager in the league, get their team and teamvalue and points.
+    2. Calculate the profit/loss.
+    3. Calculate their current cash value.
+    4. See how many 500k players, player with biggest market value.
+    5. Perhaps add expected points.
+"""
+
+
+class UserTable:
+    def __init__(self, user_id: int, name: str):
+        self.user_id = user_id
+        self.name = name
+        self.team_value = 0
+        self.team = []
+        self.total_points = 0
+        self.placement = 0
+        self.matchday_wins = 0
+        self.tv_change = (
+            0  # Change of the team value between last match day and current matchday
+        )
+        self.pnl = 0
+        self.bigboy = ""  # Name of player with highest market value
+        self.bigboy_value = 0
+        self.half_million_players = 0
+        self.expected_points = 0  # Of the best lineup of the team, per match day
+        self.biggest_overpay = 0
+        self.biggest_overpay_player = ""
+        self.biggest_lose = 0
+        self.biggest_lose_player = ""
+        self.biggest_win = 0
+        self.biggest_win_player = ""
+
+    def return_data(self) -> dict:
+        # Columns of the table, the profile picture is added to the name by the renderer
+        data_dict = {
+            "Name": self.name,
+            "Teamwert": (
+                format_numbers(self.team_value)
+                + f" ({format_numbers(self.tv_change)}"
+                + "⬆️)"
+                if self.tv_change > 0
+                else format_numbers(self.team_value)
+                + f" ({format_numbers(self.tv_change)}"
+                + "⬇️)"
+            ),
+            "Gesamtpunkte": self.total_points,
+            "Matchday-Siege": self.matchday_wins,
+            # "pnl" : self.pnl, # Kann man kalkulierten mit dem Anfangswert und Trades aber cba
+            "Big Boy": self.bigboy + f" ({format_numbers(self.bigboy_value)})",
+            "500k Spieler": self.half_million_players,
+            "Erwartete Punkte": round(self.expected_points),
+            "Größter overpay Spieler": self.biggest_overpay_player
+            + f" ({format_numbers(self.biggest_overpay)})",
+            "Größter Verlust Spieler": self.biggest_lose_player
+            + f" ({format_numbers(self.biggest_lose)})",
+            "Größter Gewinn Spieler": self.biggest_win_player
+            + f" ({format_numbers(self.biggest_win)})",
+        }
+        return data_dict
+
+    def __repr__(self):
+        return f"UserTable({self.user_id}, {self.name}, {self.team_value}, {self.total_points}, {self.placement}, {self.matchday_wins}, {self.tv_change}, {self.pnl}, {self.bigboy}, {self.bigboy_value}, {self.half_million_players}, {self.expected_points}, {self.biggest_overpay}, {self.biggest_overpay_player}, {self.biggest_lose}, {self.biggest_lose_player}, {self.biggest_win}, {self.biggest_win_player})"
+
+    def __str__(self):
+        return f"UserTable({self.user_id}, {self.name}, {self.team_value}, {self.total_points}, {self.placement}, {self.matchday_wins}, {self.tv_change}, {self.pnl}, {self.bigboy}, {self.bigboy_value}, {self.half_million_players}, {self.expected_points}, {self.biggest_overpay}, {self.biggest_overpay_player}, {self.biggest_lose}, {self.biggest_lose_player}, {self.biggest_win}, {self.biggest_win_player})"
+
+
+def format_numbers(number: int | float) -> str:
+    # Only keep first four relevant digits for numbers in the hundred million
+    # 3 digits for 10 million
+    # 2 digits for 1 million
+    # all 6 digits for hundred thousands
+    # remove any number behind the comma
+    if abs(number) >= 1_000_000:
+        return f"{number / 10**6:.1f}M"
+    elif abs(number) < 1000:
+        return f"{number:.1f}"
+    return f"{number / 1000:.1f}K"
+
+
+def get_users(client: KickbaseClient, league_id: str) -> dict[int, UserTable]:
+    """
+    Get all users and their IDs in the league.
+    """
+    url = f"/v4/leagues/{league_id}/overview?includeManagersAndBattles=true"
+    data = call_api(client, url, model=LeagueOverview)
+    user_table = {}
+    for manager in data.managers:
+        user_table[manager.id] = UserTable(user_id=manager.id, name=manager.name)
+    return user_table
+
+
+def get_user_stats(
+    engine: FetchEngine, league_id: str, user_ids: list[int]
+) -> list[ManagerStats]:
+    """
+    ### Get the user stats for the given users in the league, fetched concurrently.
+    """
+    urls = [
+        f"/v4/leagues/{league_id}/managers/{user_id}/dashboard" for user_id in user_ids
+    ]
+    try:
+        data = engine.map(urls, model=ManagerStats)
+        return data
+    except Exception as e:
+        raise ApiError(f"Error fetching user stats: {e}") from e
+
+
+def get_user_team(
+    engine: FetchEngine, league_id: str, user_ids: list[int]
+) -> list[Squad]:
+    """
+    ### Get the teams of the given users in the league, fetched concurrently.
+    """
+    urls = [f"/v4/leagues/{league_id}/managers/{user_id}/squad" for user_id in user_ids]
+    try:
+        data = engine.map(urls, model=Squad)
+        return data
+    except Exception as e:
+        raise ApiError(f"Error fetching user team: {e}") from e
+
+
+def iter_transfers(
+    client: KickbaseClient, league_id: int, high_water_mark: Optional[dict] = None
+) -> Iterator[list[Activity]]:
+    """### Yield the transfers of every page of the league's activity feed as soon as it arrives.
+
+    The next page is fetched in the background while the caller processes the current one.
+
+    Args:
+        client (KickbaseClient): The logged in API client.
+        league_id (str): The league ID.
+        high_water_mark (dict): ID and date of the newest already known transfer. The feed is
+            sorted newest first, so paging stops at the first page reaching it.
+
+    Returns:
+        Iterator: The transfers of each page, newest first.
+    """
+
+    def fetch_page(start_point: int) -> list[Activity]:
+        ### Send GET request to get the next 26 entries
+        url = f"/v4/leagues/{league_id}/activitiesFeed/?max=26&start={start_point}"
+        try:
+            response = client.get(url)
+            response.raise_for_status()
+            return decode(response.content, ActivityFeed).activities
+        except RequestException as e:
+            status = e.response.status_code if e.response is not None else None
+            raise ApiError(f"Error fetching transfers: {e}", status) from e
+
+    def reaches_high_water_mark(activities: list[Activity]) -> bool:
+        ### Everything after this page is already known
+        return bool(high_water_mark) and any(
+            entry.id == high_water_mark["id"] or entry.date <= high_water_mark["date"]
+            for entry in activities
+        )
+
+    for activities in iter_pages(fetch_page, 26, reaches_high_water_mark):
+        ### Filter transfers, activities of type 15
+        yield [entry for entry in activities if entry.type == 15]
+
+
+def get_newest_activity(client: KickbaseClient, league_id: int) -> Optional[str]:
+    """### Get the ID of the newest activity in the league's feed, None if the feed is empty."""
+    url = f"/v4/leagues/{league_id}/activitiesFeed/?max=1&start=0"
+    activities = call_api(client, url, ttl=NO_CACHE, model=ActivityFeed).activities
+    return activities[0].id if activities else None
+
+
+def get_player_statistics(
+    engine: FetchEngine, league_id: int, player_ids: list[int]
+) -> list[dict]:
+    """
+    Get the statistics of the given players, fetched concurrently.
+    """
+    urls = [
+        f"/v4/competitions/1/players/{player_id}?leagueId={league_id}"
+        for player_id in player_ids
+    ]
+    return engine.map(urls)
+
+
+def get_player_metadata(
+    engine: FetchEngine,
+    store: Store,
+    league_id: int,
+    player_ids: list,
+    max_age: float = PLAYER_METADATA_MAX_AGE,
+) -> dict:
+    """
+    Get the names of the given players, every player is fetched only once and saved in the store.
+    """
+    player_ids = list(dict.fromkeys(player_ids))  # Distinct, keeps the order
+    ### Leagues processed in parallel wait for each other instead of fetching the same players
+    with _player_metadata_lock:
+        saved = store.players(player_ids, max_age)
+        missing = [player_id for player_id in player_ids if str(player_id) not in saved]
+        if missing:
+            fetched = dict(
+                zip(missing, get_player_statistics(engine, league_id, missing))
+            )
+            store.save_players(fetched)
+            logging.info(f"Fetched metadata of {len(missing)} players")
+        else:
+            fetched = {}
+    return {
+        player_id: fetched.get(player_id) or saved[str(player_id)]
+        for player_id in player_ids
+    }
+
+
+def get_player_marketvalue_date(
+    store: MarketValueStore, player_id: int, start_date: str
+) -> int:
+    ### Take the START_DATE value of the player and fall back to yesterday's value if there is none
+    series = store.series(player_id)
+    price = series.get(date_to_day_number(start_date), 0) or series.get(
+        yesterday_day_number(), 0
+    )
+    if price == 0:
+        log_event(
+            "no_price",
+            logging.INFO,
+            player=player_id,
+            date=start_date,
+            market_values=len(series),
+        )
+    return price
+
+
+def get_turnovers(
+    client: KickbaseClient,
+    selected_league: int,
+    league_start: str,
+    user_table: dict[int, UserTable],
+    update_turnovers: bool,
+    store: Store,
+    engine: Optional[FetchEngine] = None,
+    mv_store: Optional[MarketValueStore] = None,
+) -> None:
+    """### Retrieves all turnovers in the league.
+
+    Args:
+        client (KickbaseClient): The logged in API client.
+        selected_league (object): The league the user wants to get data from for the frontend.
+        league_start (str): Creation date of the league.
+        user_table (dict): Users whose biggest overpay, win and loss are filled in.
+        update_turnovers (bool): Apply the new transfers to the ledger, otherwise only read it.
+        store (Store): Local database with the transfers and the ledger of earlier runs.
+        engine (FetchEngine): Engine to fetch the player statistics concurrently with.
+        mv_store (MarketValueStore): Market values of the players shared with the other stages.
+    """
+    logging.info("Getting turnovers...")
+    engine = engine or FetchEngine(client)
+    mv_store = mv_store or MarketValueStore(engine)
+
+    ### Get new transfers from the API, stopping at the newest one already saved.
+    ### Every page is enriched while the next one is downloaded, but the transfers are only saved
+    ### once paging is complete. Saving moves the high water mark, an interrupted sync must not
+    ### move it past pages that were never fetched.
+    new_transfers = []
+    for transfers in iter_transfers(
+        client, selected_league, store.high_water_mark(selected_league)
+    ):
+        new_transfers.extend(transfers)
+        if update_turnovers:
+            player_ids = [item.data.player_id for item in transfers]
+            get_player_metadata(engine, store, selected_league, player_ids)
+            mv_store.prefetch(player_ids)
+    found = len(new_transfers)
+    added = store.add_activities(selected_league, new_transfers)
+    logging.debug(f"Found {found} current transfers from the API")
+    logging.info(f"Saved {added} new transfers")
+
+    ### Apply only the transfers added since the last run to the ledger
+    ledger = TurnoverLedger(league_start, *store.load_ledger_state(selected_league))
+    if update_turnovers:
+        new_items = store.unapplied_activities(selected_league)
+        logging.info(f"Processing {len(new_items)} new transfers...")
+        ### Players of earlier unapplied transfers may still be missing, known ones are not fetched again
+        player_ids = [item.data.player_id for item in new_items]
+        all_player_stats = get_player_metadata(
+            engine, store, selected_league, player_ids
+        )
+        mv_store.prefetch(player_ids)
+        for item in new_items:
+            if item.date in ledger.known_dates:
+                continue
+            new_transfer = build_transfer(item, all_player_stats[item.data.player_id])
+            new_transfer["marketPrice"] = get_player_marketvalue_date(
+                mv_store,
+                item.data.player_id,
+                datetime.strptime(item.date, "%Y-%m-%dT%H:%M:%SZ").strftime("%d.%m.%Y"),
+            )
+            ledger.apply(new_transfer)
+            log_event(
+                "transfer_applied",
+                date=new_transfer["date"],
+                type=new_transfer["type"],
+                user=new_transfer["user"],
+                player=new_transfer["playerId"],
+                price=new_transfer["price"],
+            )
+        store.save_ledger_changes(selected_league, **ledger.changes())
+    logging.info("Got all turnovers.")
+
+    for user in user_table.values():
+        stats = ledger.stats(user.name)
+        if "overpay" in stats:
+            user.biggest_overpay = stats["overpay"]["value"]
+            user.biggest_overpay_player = stats["overpay"]["player"]
+        biggest_win = stats.get("win", {"value": 0, "player": ""})
+        user.biggest_win = biggest_win["value"]
+        user.biggest_win_player = biggest_win["player"]
+        biggest_loss = stats.get("loss", {"value": 0, "player": ""})
+        user.biggest_lose = biggest_loss["value"]
+        user.biggest_lose_player = biggest_loss["player"]
+
+
+def build_transfer(item: Activity, player_stats: dict) -> dict:
+    """### Create a custom json dict for a transfer activity.
+
+    Args:
+        item (Activity): Transfer activity from the activities feed.
+        player_stats (dict): Statistics of the transferred player.
+    """
+    user = None
+    trade_partner = None
+    ### Determine the transfer type based on the type and metadata
+    data = item.data or ActivityData()
+    if item.type == 15:
+        if data.seller is not None and data.buyer is not None:
+            transfer_type = "sell"
+            user = data.seller
+            trade_partner = data.buyer
+        elif data.seller is not None:
+            transfer_type = "sell"
+            user = data.seller
+            trade_partner = "Kickbase"
+        elif data.buyer is not None:
+            transfer_type = "buy"
+            user = data.buyer
+            trade_partner = "Kickbase"
+        else:
+            transfer_type = "unknown"
+    else:
+        transfer_type = "unknown"
+    return {
+        "date": item.date,
+        "type": transfer_type,
+        "user": user,
+        "tradePartner": trade_partner,
+        "price": data.price,
+        "playerId": data.player_id,
+        "teamId": data.team_id,
+        "firstName": player_stats.get("fn", None),
+        "lastName": player_stats["ln"],
+    }
+
+
+def migrate_json_files(store: Store, league_id: str, league_start: str) -> None:
+    """### Import the JSON files written by older versions into an empty store.
+
+    The raw transfers of all_transfers.json are saved as activities and the already processed
+    transfers of transfers_form.json are replayed into the ledger, so nothing has to be fetched again.
+    """
+    if store.has_ledger(league_id) or store.high_water_mark(league_id):
+        return
+    if path.exists("all_transfers.json"):
+        with open("all_transfers.json", "r") as f:
+            all_transfers = json.load(f)
+        if isinstance(all_transfers, dict):
+            all_transfers = all_transfers["transfers"]
+        store.add_activities(league_id, msgspec.convert(all_transfers, list[Activity]))
+        logging.info(f"Imported {len(all_transfers)} transfers from all_transfers.json")
+    if path.exists("transfers_form.json"):
+        with open("transfers_form.json", "r") as f:
+            transfers = json.load(f)
+        ledger = TurnoverLedger(league_start)
+        for transfer in transfers:
+            ledger.apply(transfer)
+        store.save_ledger_changes(league_id, **ledger.changes())
+        logging.info(
+            f"Imported {len(transfers)} processed transfers from transfers_form.json"
+        )
+
+
+def get_match_days(
+    client: KickbaseClient, competition_id: int = 1, ttl: Optional[float] = None
+) -> tuple:
+    """### Fetch all matches for every match day in the current season and save to JSON
+
+    Args:
+        client (KickbaseClient): The logged in API client.
+        competition_id (int): The competition ID (default: 1 which is the Bundesliga)
+        ttl (float): Overrides the cache policy, NO_CACHE to see a new match day right away.
+
+    Returns:
+        tuple: A tuple containing the current match day number and a list of dictionaries. Each dictionary contains the match day number, the start date & time of the first match, and the start date & time of the last match.
+    """
+    url = f"/v4/competitions/{competition_id}/matchdays"
+    response = call_api(client, url, ttl=ttl)
+    match_days = []
+    current_match_day = response["day"]
+
+    if response["it"]:
+        for match_day in response["it"]:
+            first_match = match_day["it"][0][
+                "dt"
+            ]  ### Start date & time of the first match
+            last_match = match_day["it"][-1][
+                "dt"
+            ]  ### Start date & time of the last match
+
+            match_days.append(
+                {
+                    "day": match_day["day"],
+                    "firstMatch": first_match,
+                    "lastMatch": last_match,
+                }
+            )
+
+    logging.info("Match days fetched.")
+
+    return current_match_day, match_days
+
+
+def get_ranking(
+    client: KickbaseClient,
+    league_id: str,
+    match_day: int,
+    ttl: Optional[float] = None,
+    refresh: bool = False,
+) -> Ranking:
+    """### Fetch the league ranking with the team value and points of every user on the match day.
+
+    Args:
+        client (KickbaseClient): The logged in API client.
+        league_id (str): The league ID.
+        match_day (int): The match day number.
+        ttl (float): Overrides the cache policy of the ranking.
+        refresh (bool): Skip the cache lookup but still store the response, so later lookups get it.
+    """
+    url = f"/v4/leagues/{league_id}/ranking/?dayNumber={match_day}"
+    if refresh:
+        return fetch_json(client, url, ttl, Ranking)
+    return call_api(client, url, ttl=ttl, model=Ranking)
+
+
+def get_rankings_per_match_day(
+    client: KickbaseClient,
+    selected_league: object,
+    current_match_day: int,
+    match_days_list: list,
+) -> dict[int, dict[int, int]]:
+    """### Fetches the league ranking once for every match day that has already started.
+
+    Args:
+        client (KickbaseClient): The logged in API client.
+        selected_league (object): The league the user wants to get data from for the frontend.
+        current_match_day (int): The current match day number.
+        match_days_list (list): Match days as returned by get_match_days.
+
+    Returns:
+        dict: Maps every match day to a dictionary of user ID -> team value on that match day.
+    """
+    rankings = {}
+    for match_day in match_days_list:
+        ### Skip processing if the match day is in the future
+        if match_day["day"] > current_match_day:
+            continue
+        ### Rankings of finished match days can't change anymore
+        ttl = NEVER_EXPIRE if match_day["day"] < current_match_day else None
+        ranking = get_ranking(client, selected_league, match_day["day"], ttl)
+        rankings[match_day["day"]] = {
+            entry.user_id: entry.team_value for entry in ranking.users
+        }
+    return rankings
+
+
+def get_team_value_per_match_day(
+    client: KickbaseClient,
+    selected_league: object,
+    userlist: dict[int, UserTable],
+    store: Store,
+    match_days: Optional[tuple] = None,
+) -> tuple[dict, str]:
+    """### Calculates the team value per match day for all users in the league.
+
+    Args:
+        client (KickbaseClient): The logged in API client.
+        selected_league (object): The league the user wants to get data from for the frontend.
+        store (Store): Local database the team values are saved in.
+        match_days (tuple): Result of get_match_days if it was already fetched.
+    """
+    logging.info("Calculating team value per match day...")
+
+    final_team_value = {}
+
+    ### Get all match days of the season
+    current_match_day, match_days_list = match_days or get_match_days(client)
+
+    ### Every ranking already holds the team value of every manager, so fetch each match day only once
+    rankings = get_rankings_per_match_day(
+        client, selected_league, current_match_day, match_days_list
+    )
+
+    for user_id, user_info in userlist.items():
+        ### Fill the team value for each match day from the shared rankings
+        team_value = {match_day: 0 for match_day in range(1, current_match_day + 1)}
+        for match_day, ranking in rankings.items():
+            if len(team_value) >= match_day:
+                team_value[match_day] = ranking.get(user_id, 0)
+
+        final_team_value[user_info.name] = team_value
+
+    logging.info("Calculated team value per match day.")
+    store.save_team_values(
+        selected_league,
+        (
+            (user_id, user_info.name, match_day, value)
+            for user_id, user_info in userlist.items()
+            for match_day, value in final_team_value[user_info.name].items()
+        ),
+    )
+    return final_team_value, current_match_day
+
+
+def iter_manager_transfers(
+    client: KickbaseClient, league_id: int, user_id: int
+) -> Iterator[list]:
+    """### Yield every page of the manager's transfers, the next page is fetched in the background."""
+
+    def fetch_page(start_point: int) -> list:
+        url = f"/v4/leagues/{league_id}/managers/{user_id}/transfer?start={start_point}"
+        return call_api(client, url).get("it") or []
+
+    return iter_pages(fetch_page, 25)
+
+
+def get_initial_team_value(
+    client: KickbaseClient,
+    user_id: int,
+    selected_league: object,
+    start_date: str,
+    mv_store: MarketValueStore,
+) -> int:
+    """### Fetches the initial team for the user in the selected league.
+
+    Args:
+        client (KickbaseClient): The logged in API client.
+        user_id (int): User for which to fetch inital team.
+        selected_league (object): The league the user wants to get data from for the frontend.
+        start_date (str): Start date of the league.
+        mv_store (MarketValueStore): Market values of the players shared with the other stages.
+
+    Returns:
+        dict: Value of initial team
+    """
+    logging.info("Fetching initial team...")
+    start_date = datetime.strptime(start_date, "%Y-%m-%dT%H:%M:%SZ").strftime(
+        "%d.%m.%Y"
+    )
+    init_team_value = 0
+    ### The starters of each page are priced while the next page is downloaded
+    for transfers in iter_manager_transfers(client, selected_league, user_id):
+        starters = [
+            transfer
+            for transfer in transfers
+            if transfer.get("tty") == 0 and transfer.get("trp") == 0
+        ]  # Indicates that the player was a starter player.
+        mv_store.prefetch(transfer["pi"] for transfer in starters)
+        for transfer in starters:
+            price = get_player_marketvalue_date(mv_store, transfer["pi"], start_date)
+            init_team_value += price
+    return init_team_value
+
+
+def select_leagues(
+    leagues: list[dict], league_names: Optional[list[str]]
+) -> list[dict]:
+    """### Select the leagues to report on by name, all leagues of the user if no names are given."""
+    if not league_names:
+        return leagues
+    selected = [league for league in leagues if league["name"] in league_names]
+    missing = set(league_names) - {league["name"] for league in selected}
+    if missing:
+        raise Exception(f"Leagues not found: {', '.join(sorted(missing))}")
+    return selected
+
+
+def load_expected_points_model(store: Store) -> Optional["ExpectedPointsModel"]:
+    """### Fit the expected points of all players, None if the crawl never ran."""
+    from .prediction import ExpectedPointsModel
+
+    model = ExpectedPointsModel.from_store(store)
+    if not len(model.performance):
+        logging.info(
+            "No player performance saved, run `python -m kickbase_lister crawl` for expected points"
+        )
+        return None
+    logging.info(f"Fitted expected points of {len(model)} players")
+    return model
+
+
+def report_league(
+    client: KickbaseClient,
+    engine: FetchEngine,
+    store: Store,
+    mv_store: MarketValueStore,
+    league: dict,
+    match_days: tuple,
+    update_turnovers: bool = True,
+    model: Optional["ExpectedPointsModel"] = None,
+) -> str:
+    """### Creates the styled table of one league.
+
+    Args:
+        client (KickbaseClient): The logged in API client.
+        engine (FetchEngine): Engine shared by all leagues of the run.
+        store (Store): Local database shared by all leagues of the run.
+        mv_store (MarketValueStore): Market values of the players shared by all leagues of the run.
+        league (dict): The league as listed in User.leagues.
+        match_days (tuple): Current match day and match days as returned by get_match_days.
+        update_turnovers (bool): Apply the new transfers to the ledger, otherwise only read it.
+        model (ExpectedPointsModel): Predicts the expected points of the teams, left at 0 if not given.
+
+    Returns:
+        str: Filename of the styled table.
+    """
+    league_id = league["id"]
+    league_start = league["creation"]
+    logging.info(f"Creating report for league {league['name']}...")
+    stage = client.metrics.stage
+    with stage("users"):
+        user_table = get_users(client, league_id)
+    with stage("team values"):
+        historical_team_values, current_match_day = get_team_value_per_match_day(
+            client, league_id, user_table, store, match_days
+        )
+    with stage("turnovers"):
+        get_turnovers(
+            client,
+            league_id,
+            league_start,
+            user_table,
+            update_turnovers,
+            store,
+            engine,
+            mv_store,
+        )
+
+    with stage("stats"):
+        all_user_stats = get_user_stats(engine, league_id, list(user_table))
+    with stage("squads"):
+        all_user_teams = get_user_team(engine, league_id, list(user_table))
+    with stage("managers"):
+        for user_stats, user_team, (user_id, user_info) in zip(
+            all_user_stats, all_user_teams, user_table.items()
+        ):
+            user_info.team_value = user_stats.team_value
+            user_info.total_points = user_stats.total_points
+            user_info.placement = user_stats.placement
+            user_info.matchday_wins = user_stats.matchday_wins
+            user_info.team = user_team.players
+            if model:
+                user_info.expected_points = model.squad_points(user_info.team)
+            bigboy = max(
+                user_info.team,
+                key=lambda player: player.market_value,
+                default=SquadPlayer(player_id="", name="NA"),
+            )
+            user_info.bigboy = bigboy.name
+            user_info.bigboy_value = bigboy.market_value
+            user_info.half_million_players = sum(
+                1 for player in user_info.team if player.market_value <= 500000
+            )
+            if current_match_day == 1:  # Also bevor dem ersten Spieltag
+                user_info.tv_change = historical_team_values[user_info.name].get(
+                    current_match_day
+                ) - get_initial_team_value(
+                    client, user_id, league_id, league_start, mv_store
+                )
+            else:
+                user_info.tv_change = historical_team_values[user_info.name].get(
+                    current_match_day
+                ) - historical_team_values[user_info.name].get(current_match_day - 1)
+    print(user_table)
+
+    with stage("render"):
+        return style_table(
+            [user for user in user_table.values() if "ludw1" not in user.name],
+            f"styled_table_{league_id}.html",
+        )
+
+
+def main(
+    league_names: Optional[list[str]] = None,
+    max_workers: int = 4,
+    open_browser: bool = True,
+    cassette: Optional[Cassette] = None,
+) -> list[str]:
+    """### Creates the styled tables of the given leagues concurrently.
+
+    Args:
+        league_names (list): Names of the leagues, all leagues of the user if not given.
+        max_workers (int): Number of leagues processed at the same time.
+        open_browser (bool): Open the table in the browser if there is only one league.
+        cassette (Cassette): Record the API traffic of the run or replay it without network access.
+
+    Returns:
+        list: Filenames of the styled tables.
+    """
+    from .columnar import MarketValueHistory
+
+    client = KickbaseClient(cache=ResponseCache(), cassette=cassette)
+    stage = client.metrics.stage
+    with stage("login"):
+        if cassette and cassette.replaying:
+            ### The replayed login must not replace the saved token
+            user = login(client, credentials_file=None)
+        else:
+            ### Recordings log in so the cassette holds everything a replay needs
+            user = login(client, force=bool(cassette))
+    store = Store()
+    rate = FETCH_RATE
+    if cassette and cassette.replaying:
+        ### The replay doesn't reach the API, its pacing speeds up with the recorded latencies
+        rate = FETCH_RATE * cassette.speed
+    engine = FetchEngine(client, concurrency=FETCH_CONCURRENCY, rate=rate)
+    mv_store = MarketValueStore(engine, store, MarketValueHistory.load())
+    leagues = select_leagues(user.leagues, league_names)
+    if len(leagues) == 1:
+        ### The JSON files of older versions only belong to a single league
+        migrate_json_files(store, leagues[0]["id"], leagues[0]["creation"])
+
+    ### Match days, player metadata, market values and predictions are shared by all leagues
+    with stage("match days"):
+        match_days = get_match_days(client)
+    with stage("model"):
+        model = load_expected_points_model(store)
+    with stage("leagues"), ThreadPoolExecutor(max_workers=max_workers) as pool:
+        filenames = list(
+            pool.map(
+                lambda league: report_league(
+                    client,
+                    engine,
+                    store,
+                    mv_store,
+                    league,
+                    match_days,
+                    model=model,
+                ),
+                leagues,
+            )
+        )
+    with stage("save history"):
+        mv_store.save_history()
+    logging.info(f"API cache: {client.cache.stats()}")
+    report = client.metrics.save_report(RUN_REPORT_FILE)
+    logging.info(
+        f"{report['requests']} API requests ({report['bytes'] / 2**20:.1f} MiB) in {report['seconds']:.1f}s, "
+        f"run report written to {RUN_REPORT_FILE}"
+    )
+    if cassette and cassette.recording:
+        cassette.save()
+        logging.info(
+            f"Recorded {len(cassette.entries)} requests to {cassette.filename}"
+        )
+    if open_browser and len(filenames) == 1:
+        import webbrowser
+
+        webbrowser.open(filenames[0])  # Öffnet direkt die Tabelle
+    return filenames
+